@@ -4,11 +4,13 @@ Searches for news articles on a specific date and topic, then generates interest
 """
 
 import os
+import httpx
+import litellm
 from crewai import LLM, Agent, Task, Crew, Process
 from crewai_tools import SerperDevTool
 from dotenv import load_dotenv
 from gradient_adk import entrypoint
-from typing import Dict
+from typing import Dict, List
 
 # Import prompts - edit prompts.py to customize agent behavior
 from prompts import (
@@ -27,29 +29,82 @@ from prompts import (
 # Load environment variables
 load_dotenv()
 
+# Share one pooled HTTP/2 client across all LLM calls so concurrent crews
+# multiplex over warm connections instead of opening one per request
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+litellm.client_session = httpx.Client(http2=True, timeout=60, limits=_HTTP_LIMITS)
+litellm.aclient_session = httpx.AsyncClient(http2=True, timeout=60, limits=_HTTP_LIMITS)
+
+# Pooled client for Serper searches; researchers running in parallel reuse
+# warm connections instead of paying a TLS handshake per search
+_SEARCH_CLIENT = httpx.Client(
+    http2=True,
+    timeout=10,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+)
+
+
+class PooledSerperDevTool(SerperDevTool):
+    """
+    SerperDevTool that sends requests through the shared HTTP client.
+
+    Overrides SerperDevTool._make_api_request, which is not a public hook, so
+    crewai-tools is pinned in requirements.txt to the version this mirrors.
+    Check this method against the upstream one when bumping the pin.
+    """
+
+    def _make_api_request(self, search_query: str, search_type: str) -> dict:
+        payload = {"q": search_query, "num": self.n_results}
+        response = _SEARCH_CLIENT.post(
+            self._get_search_url(search_type),
+            headers={"X-API-KEY": os.environ["SERPER_API_KEY"]},
+            json=payload,
+        )
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            raise ValueError("Empty response from Serper API")
+        return results
+
+
 # Initialize the search tool
-search_tool = SerperDevTool()
+search_tool = PooledSerperDevTool()
+
+# Maximum number of crews run concurrently for batch requests
+MAX_CONCURRENT_CREWS = int(os.getenv("MAX_CONCURRENT_CREWS", "4"))
 
+# Placeholders filled in by CrewAI from the kickoff inputs
+TOPIC_PLACEHOLDER = "{topic}"
+DATE_PLACEHOLDER = "{date}"
+
+
+# Create the base LLM that will be used by the agents
+llm = LLM(
+    model="openai-gpt-4.1",
+    base_url="https://inference.do-ai.run/v1",
+    api_key=os.getenv("DIGITALOCEAN_INFERENCE_KEY"),
+    temperature=0.5
+)
 
-def create_trivia_crew(date: str, topic: str):
+
+def create_trivia_crew():
     """
     Creates a crew with two agents:
     - Research Agent: Finds news articles
     - Trivia Agent: Generates interesting facts
-    """
 
-    # Create the base LLM that will be used by the agents
-    llm = LLM(
-        model="openai-gpt-4.1",
-        base_url="https://inference.do-ai.run/v1",
-        api_key=os.getenv("DIGITALOCEAN_INFERENCE_KEY"),
-        temperature=0.5
-    )
+    The LLM is created once at module load and shared across requests. The
+    agents are built per crew because CrewAI interpolates kickoff inputs into
+    them in place, so sharing them would let concurrent kickoffs race.
+
+    Goals and task descriptions use {topic}/{date} placeholders, so the same
+    crew can be kicked off for any number of (date, topic) inputs.
+    """
 
     # Agent 1: News Researcher
     researcher = Agent(
         role=RESEARCHER_ROLE,
-        goal=get_researcher_goal(topic, date),
+        goal=get_researcher_goal(TOPIC_PLACEHOLDER, DATE_PLACEHOLDER),
         backstory=RESEARCHER_BACKSTORY,
         tools=[search_tool],
         verbose=True,
@@ -69,14 +124,14 @@ def create_trivia_crew(date: str, topic: str):
 
     # Task 1: Research news articles
     research_task = Task(
-        description=get_research_task_description(topic, date),
+        description=get_research_task_description(TOPIC_PLACEHOLDER, DATE_PLACEHOLDER),
         agent=researcher,
         expected_output=RESEARCH_TASK_EXPECTED_OUTPUT,
     )
 
     # Task 2: Generate trivia
     trivia_task = Task(
-        description=get_trivia_task_description(topic, date),
+        description=get_trivia_task_description(TOPIC_PLACEHOLDER, DATE_PLACEHOLDER),
         agent=trivia_generator,
         expected_output=TRIVIA_TASK_EXPECTED_OUTPUT,
         context=[research_task],  # This task depends on the research task
@@ -93,12 +148,33 @@ def create_trivia_crew(date: str, topic: str):
     return crew
 
 
+async def run_batch(crew: Crew, inputs: List[Dict]) -> List:
+    """
+    Run the crew for many (date, topic) inputs in parallel.
+
+    Inputs are processed in groups of MAX_CONCURRENT_CREWS to stay within
+    the Serper and inference rate limits. kickoff_for_each_async runs each
+    input on its own copy of the crew, so the runs don't share agents.
+    """
+    results = []
+    for start in range(0, len(inputs), MAX_CONCURRENT_CREWS):
+        group = inputs[start:start + MAX_CONCURRENT_CREWS]
+        results.extend(await crew.kickoff_for_each_async(inputs=group))
+    return results
+
+
 @entrypoint
 async def main(input: Dict, context: Dict):
+    crew = create_trivia_crew()
+
+    # Batch mode: {"batch": [{"date": ..., "topic": ...}, ...]}
+    if "batch" in input:
+        results = await run_batch(crew, input["batch"])
+        return {"results": results}
+
     date = input.get("date")
     topic = input.get("topic")
 
-    crew = create_trivia_crew(date, topic)
-    result = crew.kickoff()
+    result = await crew.kickoff_async(inputs={"date": date, "topic": topic})
 
     return {"result": result}
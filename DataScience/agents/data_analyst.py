@@ -7,34 +7,83 @@ including creating visualizations and charts.
 
 import os
 import io
-import sys
+import re
+import asyncio
+import json
+import mmap
+import time
 import base64
+import shutil
+import hashlib
 import logging
 import tempfile
+import threading
 import traceback
-from typing import Optional, Dict, Any, List
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Dict, Any, List, Type, TYPE_CHECKING
 from pathlib import Path
 from pydantic import BaseModel, Field
 from contextlib import redirect_stdout, redirect_stderr
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate
 from langchain_gradient import ChatGradient
 
-# Import prompts from central prompts.py - edit that file to customize
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# pandas, numpy, and matplotlib are imported where they are used (mostly in
+# worker processes), so schema, help, and query requests never pay for them
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Import prompts from central prompts.py - edit that file to customize.
+# The DataScience directory is the import root (main.py lives there), so
+# prompts and agents resolve as top-level modules without touching sys.path.
 from prompts import (
     ANALYSIS_CODE_GENERATOR_SYSTEM,
     get_analysis_prompt,
     ANALYSIS_FIXER_SYSTEM,
     get_analysis_fix_prompt,
+    FAST_HELPERS_NOTE,
 )
+from agents.llm_cache import make_cache_key, get_cached, set_cached
+from agents.semantic_cache import get_semantic_cache
 
 logger = logging.getLogger(__name__)
 
+# Chat templates built once: the system message is a fixed prefix shared by
+# every request, and only the user prompt varies. System prompts are wrapped
+# as messages so braces in them are never treated as template variables.
+_ANALYSIS_CHAT_PROMPT = ChatPromptTemplate.from_messages([
+    SystemMessage(content=ANALYSIS_CODE_GENERATOR_SYSTEM),
+    ("user", "{prompt}")
+])
+_ANALYSIS_FIX_CHAT_PROMPT = ChatPromptTemplate.from_messages([
+    SystemMessage(content=ANALYSIS_FIXER_SYSTEM),
+    ("user", "{prompt}")
+])
+
 # Model configuration
 MODEL = "openai-gpt-4.1"
 
+# Fix candidates generated concurrently when analysis code fails (async path)
+NUM_FIX_CANDIDATES = 2
+FIX_CANDIDATE_TEMPERATURES = (0.0, 0.4, 0.7)
+
+# In-flight async generations by cache key, so concurrent identical requests
+# share one LLM call. No lock needed: lookups and inserts happen on the event
+# loop without an await in between.
+_INFLIGHT: Dict[str, "asyncio.Future[AnalysisCode]"] = {}
 
+
+@lru_cache(maxsize=None)
 def get_model(temperature: float = 0.0) -> ChatGradient:
-    """Get a ChatGradient instance."""
+    """
+    Get a shared ChatGradient instance for the given temperature.
+
+    Instances are cached so every call reuses the same client and its
+    keep-alive connection pool instead of paying a new TLS handshake.
+    """
     return ChatGradient(
         model=MODEL,
         temperature=temperature
@@ -56,20 +105,109 @@ class AnalysisResult(BaseModel):
     explanation: str
     output: Optional[str] = None
     error: Optional[str] = None
-    images: List[str] = Field(default_factory=list)  # Base64 encoded images
-    image_paths: List[str] = Field(default_factory=list)  # File paths if saved
+    image_paths: List[str] = Field(default_factory=list)  # Saved visualization files
+
+    @property
+    def images(self) -> List[str]:
+        """Base64 encoded images, read from image_paths on access."""
+        return [encode_image_file(Path(path)) for path in self.image_paths]
+
+
+@lru_cache(maxsize=None)
+def get_structured_model(schema: Type[BaseModel], temperature: float = 0.0):
+    """
+    Get a shared structured-output runnable for a schema and temperature.
+
+    with_structured_output builds a JSON schema and wraps the model on every
+    call, so the wrapped runnable is cached alongside the model itself.
+    """
+    return get_model(temperature=temperature).with_structured_output(schema)
 
 
 # Output directory for generated images
 OUTPUT_DIR = Path(__file__).parent.parent / "outputs"
+OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+# Limits on the data sample shown to the LLM, to keep prompt size bounded
+PROMPT_SAMPLE_ROWS = 3
+PROMPT_MAX_COLUMNS = 50
+PROMPT_MAX_CELL_CHARS = 120
+
+# Suggest the compiled helpers in agents/fast_kernels.py for results this large
+FAST_HELPERS_MIN_ROWS = 10000
+
+# Reuse results of identical code on identical data for this many seconds (0 disables)
+CHART_CACHE_TTL = int(os.environ.get("CHART_CACHE_TTL", "3600"))
+
+# Number of worker processes that execute analysis code
+ANALYSIS_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Base namespace for executing analysis code, filled in once per worker
+# process by _worker_init
+_BASE_NAMESPACE: Dict[str, Any] = {}
+
+# Seaborn is slow to import (it pulls in scipy), so it is only loaded for
+# code that actually references it
+_SEABORN_PATTERN = re.compile(r"\bsns\b|\bseaborn\b")
+
+# Likewise the fast helpers (and numba, if installed) are loaded on reference
+_FAST_HELPERS_PATTERN = re.compile(r"\bfast_(groupby_mean|rolling_std)\b")
+
+_worker_pool: Optional[ProcessPoolExecutor] = None
+_worker_pool_lock = threading.Lock()
 
 
 def ensure_output_dir():
-    """Ensure the output directory exists."""
-    OUTPUT_DIR.mkdir(exist_ok=True)
+    """Return the output directory (created once at module load)."""
     return OUTPUT_DIR
 
 
+def _clip_value(value: Any) -> Any:
+    """Truncate a long cell value so one large cell can't blow up the prompt."""
+    text = value if isinstance(value, str) else str(value)
+    if len(text) > PROMPT_MAX_CELL_CHARS:
+        return text[:PROMPT_MAX_CELL_CHARS] + "..."
+    return value
+
+
+def format_data_context(available_data: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Describe the available data sample for the analysis prompt.
+
+    Only the first PROMPT_SAMPLE_ROWS rows and PROMPT_MAX_COLUMNS columns are
+    shown, with long cell values truncated.
+
+    Args:
+        available_data: Optional sample data for context
+
+    Returns:
+        Data context block (empty if no data)
+    """
+    if not available_data:
+        return ""
+
+    columns = available_data.get('columns', [])
+    shown_columns = list(columns[:PROMPT_MAX_COLUMNS])
+    if len(columns) > PROMPT_MAX_COLUMNS:
+        shown_columns.append(f"...(+{len(columns) - PROMPT_MAX_COLUMNS} more)")
+
+    sample_rows = [
+        [_clip_value(v) for v in row[:PROMPT_MAX_COLUMNS]]
+        for row in available_data.get('rows', [])[:PROMPT_SAMPLE_ROWS]
+    ]
+
+    row_count = available_data.get('row_count', 0)
+    context = f"""
+Available data (passed as 'data' variable, a pandas DataFrame):
+Columns: {shown_columns}
+Sample rows: {sample_rows}
+Total rows: {row_count}
+"""
+    if row_count >= FAST_HELPERS_MIN_ROWS:
+        context += FAST_HELPERS_NOTE
+    return context
+
+
 def create_analysis_prompt(
     question: str,
     data_description: str,
@@ -86,16 +224,41 @@ def create_analysis_prompt(
     Returns:
         Formatted prompt
     """
-    data_context = ""
-    if available_data:
-        data_context = f"""
-Available data (passed as 'data' variable, a pandas DataFrame):
-Columns: {available_data.get('columns', [])}
-Sample rows: {available_data.get('rows', [])[:3]}
-Total rows: {available_data.get('row_count', 0)}
-"""
+    return get_analysis_prompt(question, data_description, format_data_context(available_data))
+
+
+def _lookup_analysis_cache(
+    cache_key: str,
+    question: str,
+    data_description: str
+) -> Optional[AnalysisCode]:
+    """Check the exact-match cache, then the semantic cache, for analysis code."""
+    cached = get_cached(cache_key, AnalysisCode)
+    if cached is not None:
+        return cached
+
+    semantic_cache = get_semantic_cache()
+    if semantic_cache is not None:
+        cached = semantic_cache.lookup(question, data_description, AnalysisCode)
+        if cached is not None:
+            set_cached(cache_key, cached)
+            return cached
 
-    return get_analysis_prompt(question, data_description, data_context)
+    return None
+
+
+def _store_analysis_cache(
+    cache_key: str,
+    question: str,
+    data_description: str,
+    analysis_code: AnalysisCode
+) -> None:
+    """Store generated analysis code in the exact-match and semantic caches."""
+    set_cached(cache_key, analysis_code)
+
+    semantic_cache = get_semantic_cache()
+    if semantic_cache is not None:
+        semantic_cache.add(question, data_description, analysis_code)
 
 
 def generate_analysis_code(
@@ -118,50 +281,203 @@ def generate_analysis_code(
 
     prompt = create_analysis_prompt(question, data_description, available_data)
 
-    model = get_model(temperature=0.0)
-    structured_model = model.with_structured_output(AnalysisCode)
+    cache_key = make_cache_key(MODEL, 0.0, ANALYSIS_CODE_GENERATOR_SYSTEM, prompt, AnalysisCode)
+    cached = _lookup_analysis_cache(cache_key, question, data_description)
+    if cached is not None:
+        return cached
+
+    structured_model = get_structured_model(AnalysisCode, temperature=0.0)
 
-    analysis_code = structured_model.invoke([
-        {"role": "system", "content": ANALYSIS_CODE_GENERATOR_SYSTEM},
-        {"role": "user", "content": prompt}
-    ])
+    analysis_code = structured_model.invoke(_ANALYSIS_CHAT_PROMPT.format_messages(prompt=prompt))
+
+    _store_analysis_cache(cache_key, question, data_description, analysis_code)
 
     logger.info(f"Generated code ({len(analysis_code.code)} chars), creates_visualization={analysis_code.creates_visualization}")
 
     return analysis_code
 
 
-def execute_analysis_code(
-    code: str,
-    data: Optional[Dict[str, Any]] = None,
-    timeout: int = 60
-) -> AnalysisResult:
+async def agenerate_analysis_code(
+    question: str,
+    data_description: str,
+    available_data: Optional[Dict[str, Any]] = None
+) -> AnalysisCode:
+    """
+    Async version of generate_analysis_code.
+
+    Lookups go through three tiers before calling the LLM: requests already
+    in flight (concurrent identical requests await the same call, and take
+    it over if its owner is cancelled), the exact-match cache, then the
+    semantic cache.
+
+    Args:
+        question: Analysis question
+        data_description: Description of the data
+        available_data: Optional data sample
+
+    Returns:
+        Generated analysis code
+    """
+    logger.info(f"Generating analysis code for: {question}")
+
+    prompt = create_analysis_prompt(question, data_description, available_data)
+
+    cache_key = make_cache_key(MODEL, 0.0, ANALYSIS_CODE_GENERATOR_SYSTEM, prompt, AnalysisCode)
+
+    inflight = _INFLIGHT.get(cache_key)
+    while inflight is not None:
+        logger.info(f"Awaiting in-flight generation ({cache_key[:12]})")
+        try:
+            # Shield so a cancelled waiter doesn't cancel the shared call
+            return await asyncio.shield(inflight)
+        except asyncio.CancelledError:
+            if not inflight.cancelled():
+                raise  # This waiter was cancelled
+            # The owning request was cancelled; take over (or join whichever
+            # waiter took over first) instead of failing with it
+            logger.info(f"In-flight generation was cancelled, retrying ({cache_key[:12]})")
+            inflight = _INFLIGHT.get(cache_key)
+
+    cached = _lookup_analysis_cache(cache_key, question, data_description)
+    if cached is not None:
+        return cached
+
+    future = asyncio.get_running_loop().create_future()
+    _INFLIGHT[cache_key] = future
+
+    try:
+        structured_model = get_structured_model(AnalysisCode, temperature=0.0)
+
+        analysis_code = await structured_model.ainvoke(_ANALYSIS_CHAT_PROMPT.format_messages(prompt=prompt))
+
+        _store_analysis_cache(cache_key, question, data_description, analysis_code)
+        future.set_result(analysis_code)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # Mark retrieved so unawaited failures aren't logged
+        raise
+    finally:
+        _INFLIGHT.pop(cache_key, None)
+
+    logger.info(f"Generated code ({len(analysis_code.code)} chars), creates_visualization={analysis_code.creates_visualization}")
+
+    return analysis_code
+
+
+def get_analysis_key(code: str, df: Optional["pd.DataFrame"] = None) -> str:
     """
-    Execute Python analysis code in a sandboxed environment.
+    Compute a content hash of analysis code and the data it runs on.
+
+    Identical code over identical data produces the same key, so chart
+    filenames are stable across runs and can be reused.
 
     Args:
         code: Python code to execute
-        data: Query result data to analyze
-        timeout: Execution timeout in seconds
+        df: DataFrame passed to the code as 'data'
 
     Returns:
-        Execution result with output and any generated images
+        Hex digest identifying the analysis
     """
-    import pandas as pd
+    hasher = hashlib.blake2b(code.encode(), digest_size=16)
+    if df is not None:
+        import pandas as pd
+        hasher.update(b"|")
+        hasher.update("\x1f".join(map(str, df.columns)).encode())
+        try:
+            hasher.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        except TypeError:
+            # Unhashable cells (e.g. lists or dicts) - fall back to their repr
+            hasher.update(repr(df.values.tolist()).encode())
+    return hasher.hexdigest()
+
+
+def encode_image_file(path: Path) -> str:
+    """
+    Read an image file and return it base64 encoded.
+
+    The file is memory-mapped rather than read into a bytes object, so only
+    the base64 output is held in memory.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return base64.b64encode(mm).decode("ascii")
+
+
+def load_cached_analysis(code: str, manifest_path: Path) -> Optional[AnalysisResult]:
+    """
+    Load a previous result for the same code and data, if still fresh.
+
+    Args:
+        code: Python code that would be executed
+        manifest_path: Path of the result manifest for this analysis key
+
+    Returns:
+        Cached analysis result, or None if missing or expired
+    """
+    if CHART_CACHE_TTL <= 0 or not manifest_path.exists():
+        return None
+
+    if time.time() - manifest_path.stat().st_mtime >= CHART_CACHE_TTL:
+        return None
+
+    manifest = json.loads(manifest_path.read_text())
+    image_paths = manifest.get("image_paths", [])
+    if not all(Path(path).exists() for path in image_paths):
+        return None
+
+    logger.info(f"Reusing cached analysis result: {manifest_path.name}")
+
+    return AnalysisResult(
+        success=True,
+        code=code,
+        explanation="",
+        output=manifest.get("output"),
+        image_paths=image_paths
+    )
+
+
+def _worker_init():
+    """Prepare a worker process: import analysis libraries with headless plotting."""
     import matplotlib
-    matplotlib.use('Agg')  # Non-interactive backend
+    matplotlib.use('Agg')  # Non-interactive backend, set before pyplot loads
     import matplotlib.pyplot as plt
+    import numpy as np
+    import pandas as pd
 
-    logger.info("Executing analysis code")
+    plt.close('all')
+    _BASE_NAMESPACE.update({
+        "pd": pd,
+        "np": np,
+        "plt": plt,
+        "__builtins__": __builtins__
+    })
 
-    # Prepare output directory and file
-    output_dir = ensure_output_dir()
-    output_path = output_dir / f"chart_{os.getpid()}_{id(code)}.png"
 
-    # Convert data to DataFrame
-    df = None
-    if data and data.get("columns") and data.get("rows"):
-        df = pd.DataFrame(data["rows"], columns=data["columns"])
+def _exec_worker(
+    code: str,
+    columns: Optional[List[str]],
+    rows: Optional[List[Any]],
+    output_path: str,
+    creates_visualization: bool
+) -> Dict[str, Any]:
+    """
+    Execute analysis code inside a worker process.
+
+    Runs in a separate process, so it only takes and returns picklable values.
+
+    Returns:
+        Dictionary with success, output, error, and image_paths
+    """
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
+    df = pd.DataFrame(rows, columns=columns) if columns and rows else None
+    output_file = Path(output_path)
 
     # Capture stdout and stderr
     stdout_capture = io.StringIO()
@@ -169,16 +485,17 @@ def execute_analysis_code(
 
     # Prepare execution namespace
     exec_namespace = {
-        "pd": pd,
-        "np": __import__("numpy"),
-        "plt": plt,
-        "sns": __import__("seaborn"),
+        **_BASE_NAMESPACE,
         "data": df,
-        "output_path": str(output_path),
-        "__builtins__": __builtins__
+        "output_path": output_path
     }
+    if _SEABORN_PATTERN.search(code):
+        import seaborn as sns
+        exec_namespace["sns"] = sns
+    if _FAST_HELPERS_PATTERN.search(code):
+        from agents.fast_kernels import FAST_HELPERS
+        exec_namespace.update(FAST_HELPERS)
 
-    images = []
     image_paths = []
 
     try:
@@ -187,26 +504,20 @@ def execute_analysis_code(
             exec(code, exec_namespace)
 
         # Check if a plot was saved
-        if output_path.exists():
-            # Read and encode the image
-            with open(output_path, "rb") as f:
-                image_data = base64.b64encode(f.read()).decode("utf-8")
-                images.append(image_data)
-                image_paths.append(str(output_path))
-            logger.info(f"Visualization saved to: {output_path}")
-
-        # Also check for any unsaved matplotlib figures
-        for fig_num in plt.get_fignums():
-            fig = plt.figure(fig_num)
-            if not output_path.exists() or fig_num > 1:
-                # Save additional figures
-                fig_path = output_dir / f"chart_{os.getpid()}_{id(code)}_{fig_num}.png"
-                fig.savefig(fig_path, dpi=150, bbox_inches='tight')
-                with open(fig_path, "rb") as f:
-                    image_data = base64.b64encode(f.read()).decode("utf-8")
-                    images.append(image_data)
+        if output_file.exists():
+            image_paths.append(output_path)
+
+        # Also check for any unsaved matplotlib figures (skipped for
+        # non-visual analyses, since savefig renders the whole figure)
+        if creates_visualization:
+            for fig_num in plt.get_fignums():
+                fig = plt.figure(fig_num)
+                if not output_file.exists() or fig_num > 1:
+                    # Save additional figures
+                    fig_path = output_file.with_name(f"{output_file.stem}_{fig_num}.png")
+                    fig.savefig(fig_path, dpi=150, bbox_inches='tight')
                     image_paths.append(str(fig_path))
-            plt.close(fig)
+                plt.close(fig)
 
         output = stdout_capture.getvalue()
         stderr_output = stderr_capture.getvalue()
@@ -214,30 +525,173 @@ def execute_analysis_code(
         if stderr_output:
             output += f"\nWarnings/Errors:\n{stderr_output}"
 
-        return AnalysisResult(
-            success=True,
-            code=code,
-            explanation="",
-            output=output if output else "Code executed successfully",
-            images=images,
-            image_paths=image_paths
-        )
+        return {"success": True, "output": output, "image_paths": image_paths}
 
     except Exception as e:
-        logger.error(f"Code execution failed: {e}")
-        error_trace = traceback.format_exc()
+        return {
+            "success": False,
+            "error": f"{str(e)}\n\n{traceback.format_exc()}",
+            "output": stdout_capture.getvalue()
+        }
 
+    finally:
         # Close any open figures
         plt.close('all')
 
+
+def get_worker_pool() -> ProcessPoolExecutor:
+    """Get or create the pool of processes that execute analysis code."""
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = ProcessPoolExecutor(
+                max_workers=ANALYSIS_WORKERS,
+                initializer=_worker_init
+            )
+        return _worker_pool
+
+
+def _reset_worker_pool():
+    """
+    Terminate all workers so a fresh pool is created on next use.
+
+    Used after a timeout: a process stuck in generated code cannot be
+    interrupted, only killed. Other in-flight executions fail with an error.
+    """
+    global _worker_pool
+    with _worker_pool_lock:
+        pool, _worker_pool = _worker_pool, None
+
+    if pool is not None:
+        # ProcessPoolExecutor has no public API to kill busy workers
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def execute_analysis_code(
+    code: str,
+    data: Optional[Dict[str, Any]] = None,
+    timeout: int = 60,
+    creates_visualization: bool = True
+) -> AnalysisResult:
+    """
+    Execute Python analysis code in a sandboxed worker process.
+
+    Args:
+        code: Python code to execute
+        data: Query result data to analyze
+        timeout: Execution timeout in seconds
+        creates_visualization: Whether to collect unsaved matplotlib figures
+
+    Returns:
+        Execution result with output and any generated images
+    """
+    # Convert data to DataFrame
+    df = None
+    if data and data.get("columns") and data.get("rows"):
+        import pandas as pd
+        df = pd.DataFrame(data["rows"], columns=data["columns"])
+
+    # Name outputs by content so identical analyses map to the same files
+    output_dir = ensure_output_dir()
+    analysis_key = get_analysis_key(code, df)
+    output_path = output_dir / f"chart_{analysis_key}.png"
+    manifest_path = output_dir / f"analysis_{analysis_key}.json"
+
+    cached_result = load_cached_analysis(code, manifest_path)
+    if cached_result is not None:
+        return cached_result
+
+    logger.info("Executing analysis code")
+
+    # Workers rebuild the DataFrame from plain columns/rows (cheap to pickle)
+    columns = data["columns"] if df is not None else None
+    rows = data["rows"] if df is not None else None
+
+    # Workers write into a private staging directory; finished files are then
+    # moved into place with os.replace, so concurrent runs of the same
+    # analysis never see (or delete) each other's partially written charts
+    staging_dir = Path(tempfile.mkdtemp(dir=output_dir, prefix=".staging_"))
+    try:
+        return _run_analysis_worker(
+            code, columns, rows, timeout, creates_visualization,
+            staging_dir / output_path.name, output_dir, manifest_path
+        )
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def _run_analysis_worker(
+    code: str,
+    columns: Optional[List[str]],
+    rows: Optional[List[Any]],
+    timeout: int,
+    creates_visualization: bool,
+    staged_path: Path,
+    output_dir: Path,
+    manifest_path: Path
+) -> AnalysisResult:
+    """Run code in the worker pool and publish its outputs into output_dir."""
+    future = get_worker_pool().submit(
+        _exec_worker, code, columns, rows, str(staged_path), creates_visualization
+    )
+
+    try:
+        worker_result = future.result(timeout=timeout)
+    except FuturesTimeoutError:
+        logger.error(f"Code execution timed out after {timeout} seconds")
+        future.cancel()
+        _reset_worker_pool()
+        return AnalysisResult(
+            success=False,
+            code=code,
+            explanation="",
+            error=f"Code execution timed out after {timeout} seconds"
+        )
+    except BrokenProcessPool as e:
+        logger.error(f"Analysis worker crashed: {e}")
+        _reset_worker_pool()
+        return AnalysisResult(
+            success=False,
+            code=code,
+            explanation="",
+            error=f"Analysis worker crashed: {str(e)}"
+        )
+
+    if not worker_result["success"]:
+        logger.error(f"Code execution failed: {worker_result['error'].splitlines()[0]}")
         return AnalysisResult(
             success=False,
             code=code,
             explanation="",
-            error=f"{str(e)}\n\n{error_trace}",
-            output=stdout_capture.getvalue()
+            error=worker_result["error"],
+            output=worker_result["output"]
         )
 
+    image_paths = []
+    for staged in worker_result["image_paths"]:
+        final_path = output_dir / Path(staged).name
+        os.replace(staged, final_path)
+        image_paths.append(str(final_path))
+    if image_paths:
+        logger.info(f"Visualization saved to: {', '.join(image_paths)}")
+
+    output = worker_result["output"] or "Code executed successfully"
+
+    if CHART_CACHE_TTL > 0:
+        staged_manifest = staged_path.with_name(manifest_path.name)
+        staged_manifest.write_text(json.dumps({"output": output, "image_paths": image_paths}))
+        os.replace(staged_manifest, manifest_path)
+
+    return AnalysisResult(
+        success=True,
+        code=code,
+        explanation="",
+        output=output,
+        image_paths=image_paths
+    )
+
 
 def run_analysis(
     question: str,
@@ -260,7 +714,11 @@ def run_analysis(
         analysis_code = generate_analysis_code(question, data_description, data)
 
         # Execute the code
-        result = execute_analysis_code(analysis_code.code, data)
+        result = execute_analysis_code(
+            analysis_code.code,
+            data,
+            creates_visualization=analysis_code.creates_visualization
+        )
         result.explanation = analysis_code.explanation
 
         return result
@@ -293,10 +751,141 @@ def fix_analysis_code(
     """
     prompt = get_analysis_fix_prompt(original_code, error_message, data_description)
 
-    model = get_model(temperature=0.0)
-    structured_model = model.with_structured_output(AnalysisCode)
+    cache_key = make_cache_key(MODEL, 0.0, ANALYSIS_FIXER_SYSTEM, prompt, AnalysisCode)
+    cached = get_cached(cache_key, AnalysisCode)
+    if cached is not None:
+        return cached
+
+    structured_model = get_structured_model(AnalysisCode, temperature=0.0)
+
+    fixed_code = structured_model.invoke(_ANALYSIS_FIX_CHAT_PROMPT.format_messages(prompt=prompt))
+
+    set_cached(cache_key, fixed_code)
+
+    return fixed_code
+
+
+async def afix_analysis_code(
+    original_code: str,
+    error_message: str,
+    data_description: str,
+    temperature: float = 0.0
+) -> AnalysisCode:
+    """
+    Async version of fix_analysis_code.
+
+    Args:
+        original_code: The code that failed
+        error_message: The error message received
+        data_description: Description of the data
+        temperature: Sampling temperature (vary it to get distinct candidates)
+
+    Only deterministic (temperature 0) fixes are cached; sampled candidates
+    are meant to differ between attempts, so they always call the model.
+
+    Returns:
+        Fixed analysis code
+    """
+    prompt = get_analysis_fix_prompt(original_code, error_message, data_description)
+
+    cache_key = None
+    if temperature == 0:
+        cache_key = make_cache_key(MODEL, temperature, ANALYSIS_FIXER_SYSTEM, prompt, AnalysisCode)
+        cached = get_cached(cache_key, AnalysisCode)
+        if cached is not None:
+            return cached
+
+    structured_model = get_structured_model(AnalysisCode, temperature=temperature)
+
+    fixed_code = await structured_model.ainvoke(_ANALYSIS_FIX_CHAT_PROMPT.format_messages(prompt=prompt))
+
+    if cache_key is not None:
+        set_cached(cache_key, fixed_code)
+
+    return fixed_code
 
-    return structured_model.invoke([
-        {"role": "system", "content": ANALYSIS_FIXER_SYSTEM},
-        {"role": "user", "content": prompt}
-    ])
+
+async def run_analysis_async(
+    question: str,
+    data: Dict[str, Any],
+    data_description: str,
+    num_fix_candidates: int = NUM_FIX_CANDIDATES
+) -> AnalysisResult:
+    """
+    Async analysis pipeline with concurrent error recovery.
+
+    If the generated code fails, several fix candidates are requested from
+    the LLM concurrently (at different temperatures). Each candidate is
+    executed as soon as it arrives; the first one that succeeds is returned
+    and the remaining LLM calls are cancelled.
+
+    Args:
+        question: Analysis question
+        data: Query result data to analyze
+        data_description: Description of the data
+        num_fix_candidates: Number of fix candidates to request on failure (max 3)
+
+    Returns:
+        Analysis result with output and visualizations
+    """
+    try:
+        analysis_code = await agenerate_analysis_code(question, data_description, data)
+
+        result = await asyncio.to_thread(
+            execute_analysis_code,
+            analysis_code.code,
+            data,
+            creates_visualization=analysis_code.creates_visualization
+        )
+        result.explanation = analysis_code.explanation
+        if result.success or num_fix_candidates <= 0:
+            return result
+
+        logger.info(f"Analysis code failed, requesting {num_fix_candidates} fix candidates")
+
+        temperatures = FIX_CANDIDATE_TEMPERATURES[:num_fix_candidates]
+        fix_tasks = [
+            asyncio.ensure_future(afix_analysis_code(
+                analysis_code.code, result.error, data_description, temperature=temperature
+            ))
+            for temperature in temperatures
+        ]
+
+        tried_code = {analysis_code.code}
+        try:
+            for next_fix in asyncio.as_completed(fix_tasks):
+                try:
+                    fixed_code = await next_fix
+                except Exception as fix_error:
+                    logger.warning(f"Fix candidate failed: {fix_error}")
+                    continue
+
+                if fixed_code.code in tried_code:
+                    continue
+                tried_code.add(fixed_code.code)
+
+                # Execute each candidate as it arrives, stopping at the first success
+                fixed_result = await asyncio.to_thread(
+                    execute_analysis_code,
+                    fixed_code.code,
+                    data,
+                    creates_visualization=fixed_code.creates_visualization
+                )
+                fixed_result.explanation = fixed_code.explanation
+                if fixed_result.success:
+                    logger.info("Fix candidate succeeded")
+                    return fixed_result
+        finally:
+            for task in fix_tasks:
+                task.cancel()
+
+        return result
+
+    except Exception as e:
+        logger.error(f"Analysis pipeline failed: {e}")
+        return AnalysisResult(
+            success=False,
+            code="",
+            explanation="",
+            error=str(e)
+        )
@@ -0,0 +1,126 @@
+"""
+Fast Kernels - Compiled numeric helpers for generated analysis code.
+
+Generated analysis code sometimes falls back to Python loops for grouped or
+rolling statistics, which is slow on large result sets. These helpers are
+injected into the analysis namespace (only when the code references them)
+and the analysis prompt suggests them for large DataFrames.
+
+When numba is installed the kernels are JIT-compiled, with compiled code
+cached in NUMBA_CACHE_DIR (default .numba_cache/) so worker processes don't
+recompile them. Without numba, equivalent vectorized numpy/pandas versions
+are used, so generated code runs either way.
+
+Install with: pip install numba
+"""
+
+import os
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# numba reads its cache location at import time
+os.environ.setdefault("NUMBA_CACHE_DIR", str(Path(__file__).parent.parent / ".numba_cache"))
+
+try:
+    import numba
+except ImportError:
+    numba = None
+    logger.info("numba not installed, fast helpers use numpy/pandas implementations")
+
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _grouped_sum_count(codes, values, group_count):
+        sums = np.zeros(group_count)
+        counts = np.zeros(group_count, dtype=np.int64)
+        for i in range(codes.shape[0]):
+            code = codes[i]
+            value = values[i]
+            if code >= 0 and not np.isnan(value):
+                sums[code] += value
+                counts[code] += 1
+        return sums, counts
+
+    @numba.njit(cache=True)
+    def _rolling_std(values, window):
+        # Each window is recomputed with a two-pass mean/deviation sum: a
+        # running sum/sum-of-squares (or a sliding Welford update) loses
+        # precision on large values close together. Like pandas
+        # (min_periods=window), a window holding a NaN is NaN.
+        result = np.full(values.shape[0], np.nan)
+        nan_count = 0
+        for i in range(values.shape[0]):
+            if np.isnan(values[i]):
+                nan_count += 1
+            if i >= window and np.isnan(values[i - window]):
+                nan_count -= 1
+            if i < window - 1 or nan_count > 0:
+                continue
+            start = i - window + 1
+            mean = 0.0
+            for j in range(start, i + 1):
+                mean += values[j]
+            mean /= window
+            m2 = 0.0
+            for j in range(start, i + 1):
+                delta = values[j] - mean
+                m2 += delta * delta
+            result[i] = np.sqrt(m2 / (window - 1))
+        return result
+
+def fast_groupby_mean(keys, values) -> pd.Series:
+    """
+    Mean of values per key, ignoring NaN values and null keys.
+
+    Args:
+        keys: Group keys (array-like or Series)
+        values: Numeric values aligned with keys
+
+    Returns:
+        Series of means indexed by key, in order of first appearance
+    """
+    codes, uniques = pd.factorize(np.asarray(keys))
+    values = np.asarray(values, dtype=np.float64)
+
+    if numba is not None:
+        sums, counts = _grouped_sum_count(codes, values, len(uniques))
+    else:
+        valid = (codes >= 0) & ~np.isnan(values)
+        sums = np.bincount(codes[valid], weights=values[valid], minlength=len(uniques))
+        counts = np.bincount(codes[valid], minlength=len(uniques))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pd.Series(sums / counts, index=uniques)
+
+
+def fast_rolling_std(values, window: int) -> np.ndarray:
+    """
+    Rolling sample standard deviation over a fixed window.
+
+    Args:
+        values: Numeric values (array-like or Series)
+        window: Window size in rows (at least 2)
+
+    Returns:
+        Array the same length as values; the first window - 1 entries, and
+        any window containing a NaN, are NaN (as with pandas rolling().std())
+    """
+    if window < 2:
+        raise ValueError("window must be at least 2")
+    values = np.asarray(values, dtype=np.float64)
+
+    if numba is not None:
+        return _rolling_std(values, window)
+    return pd.Series(values).rolling(window).std().to_numpy()
+
+
+# Helpers injected into the analysis namespace by name
+FAST_HELPERS = {
+    "fast_groupby_mean": fast_groupby_mean,
+    "fast_rolling_std": fast_rolling_std,
+}
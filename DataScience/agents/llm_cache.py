@@ -0,0 +1,86 @@
+"""
+LLM Response Cache - Exact-match caching for structured LLM calls.
+
+Identical requests (same model, temperature, prompts, and output schema)
+are served from an on-disk cache instead of calling the LLM again.
+
+Enable by setting LLM_CACHE_ENABLED=true in your environment.
+"""
+
+import os
+import hashlib
+import logging
+import orjson
+from pathlib import Path
+from typing import Optional, Type, TypeVar
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+# Cache configuration
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "false").lower() == "true"
+CACHE_DIR = Path(__file__).parent.parent / ".llm_cache"
+
+_cache = None
+
+
+def get_cache():
+    """Get or create the on-disk cache (None if caching is disabled)."""
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        import diskcache
+        _cache = diskcache.Cache(str(CACHE_DIR))
+    return _cache
+
+
+def make_cache_key(
+    model: str,
+    temperature: float,
+    system: str,
+    prompt: str,
+    schema: Type[BaseModel]
+) -> str:
+    """
+    Build a deterministic cache key for a structured LLM call.
+
+    Args:
+        model: Model name
+        temperature: Sampling temperature
+        system: System prompt
+        prompt: User prompt
+        schema: Pydantic model used for structured output
+
+    Returns:
+        SHA-256 hex digest identifying the request
+    """
+    payload = orjson.dumps(
+        {"m": model, "t": temperature, "sys": system, "user": prompt, "schema": schema.__name__},
+        option=orjson.OPT_SORT_KEYS
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+def get_cached(key: str, schema: Type[T]) -> Optional[T]:
+    """Return the cached response for a key, or None on a miss."""
+    cache = get_cache()
+    if cache is None:
+        return None
+
+    cached = cache.get(key)
+    if cached is None:
+        return None
+
+    logger.info(f"LLM cache hit for {schema.__name__} ({key[:12]})")
+    return schema.model_validate_json(cached)
+
+
+def set_cached(key: str, value: BaseModel) -> None:
+    """Store a structured response in the cache."""
+    cache = get_cache()
+    if cache is None:
+        return
+    cache[key] = value.model_dump_json().encode()
@@ -6,17 +6,29 @@ executes them against the database, and formats the results.
 """
 
 import os
+import re
 import sys
+import json
+import time
+import asyncio
+import hashlib
 import logging
-from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import chain
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
+from pydantic import BaseModel, ConfigDict, Field
 from langchain_gradient import ChatGradient
 
+from agents.skeleton_cache import get_skeleton_cache
+
 # Import prompts from central prompts.py - edit that file to customize
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from prompts import (
     SQL_GENERATOR_SYSTEM,
     get_nl2sql_prompt,
+    get_nl2sql_batch_prompt,
     SQL_FIXER_SYSTEM,
     get_sql_fix_prompt,
 )
@@ -26,9 +38,45 @@ logger = logging.getLogger(__name__)
 # Model configuration
 MODEL = "openai-gpt-4.1"
 
+# Maximum questions translated by a single batched LLM call
+MAX_SQL_BATCH_SIZE = 5
+
+# Cap on concurrent async LLM calls made by this agent
+MAX_CONCURRENT_LLM_CALLS = int(os.environ.get("MAX_CONCURRENT_LLM_CALLS", "8"))
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+
+
+# Wall-clock budget for executing and fixing one question's query (seconds)
+MAX_QUERY_SECONDS = int(os.environ.get("MAX_QUERY_SECONDS", "120"))
+
+# Database errors worth retrying unchanged; anything else goes to the SQL fixer
+_TRANSIENT_ERROR_PATTERN = re.compile(
+    r"connection (?:reset|refused|closed|timed out)|server closed the connection|"
+    r"could not connect|lost connection|too many connections|deadlock|"
+    r"could not serialize access|temporarily unavailable",
+    re.IGNORECASE
+)
+
+# SELECT result cache (off by default): size in entries and freshness in seconds
+RESULT_CACHE_ENABLED = os.environ.get("RESULT_CACHE_ENABLED", "false").lower() == "true"
+RESULT_CACHE_SIZE = int(os.environ.get("RESULT_CACHE_SIZE", "512"))
+RESULT_CACHE_TTL = int(os.environ.get("RESULT_CACHE_TTL", "300"))
+NO_CACHE_DIRECTIVE = "@no_cache"
+_result_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+
 
+def get_llm_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore that bounds concurrent async LLM calls."""
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM_CALLS)
+    return _llm_semaphore
+
+
+@lru_cache(maxsize=None)
 def get_model(temperature: float = 0.0) -> ChatGradient:
-    """Get a ChatGradient instance."""
+    """Get a shared ChatGradient instance for the given temperature."""
     return ChatGradient(
         model=MODEL,
         temperature=temperature
@@ -37,42 +85,171 @@ def get_model(temperature: float = 0.0) -> ChatGradient:
 
 class SQLQuery(BaseModel):
     """Generated SQL query with explanation."""
+    model_config = ConfigDict(extra="forbid")
+
     query: str = Field(description="The SQL SELECT query to execute")
     explanation: str = Field(description="Brief explanation of what the query does")
     tables_used: list[str] = Field(description="List of tables used in the query")
 
 
+class SQLQueryBatch(BaseModel):
+    """Generated SQL queries for several questions, in question order."""
+    items: List[SQLQuery] = Field(description="One SQL query per question, in order")
+
+
+class QueryData(BaseModel):
+    """Rows returned by a SQL query."""
+    model_config = ConfigDict(extra="forbid")
+
+    columns: List[str]
+    rows: List[Any]
+    row_count: int
+
+
 class QueryResult(BaseModel):
     """Result of a SQL query execution."""
+    model_config = ConfigDict(extra="forbid")
+
     success: bool
     query: str
     explanation: str
-    data: Optional[Dict[str, Any]] = None
+    data: Optional[QueryData] = None
     formatted_result: Optional[str] = None
     error: Optional[str] = None
     row_count: int = 0
 
 
+# Schema prompt format: "verbose" (one line per column) or "compact"
+# (one line per table, roughly half the tokens on wide schemas)
+SCHEMA_FORMAT = os.environ.get("SCHEMA_FORMAT", "verbose").lower()
+
+# Short names for common column types in the compact schema format
+_SHORT_TYPES = {
+    "character varying": "str",
+    "varchar": "str",
+    "character": "char",
+    "integer": "int",
+    "double precision": "float",
+    "real": "float",
+    "numeric": "num",
+    "decimal": "num",
+    "boolean": "bool",
+    "timestamp without time zone": "timestamp",
+    "timestamp with time zone": "timestamptz",
+    "time without time zone": "time",
+}
+
+
+class _SchemaRef:
+    """
+    Hashable handle that compares schema info dicts by identity.
+
+    get_cached_schema_info returns the same dict until the schema changes,
+    so identity is enough to memoize values derived from it. The lru_cache
+    holding a handle also keeps its dict alive, so ids are never reused
+    while cached.
+    """
+
+    __slots__ = ("schema_info",)
+
+    def __init__(self, schema_info: Dict[str, Any]):
+        self.schema_info = schema_info
+
+    def __hash__(self) -> int:
+        return id(self.schema_info)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _SchemaRef) and other.schema_info is self.schema_info
+
+
+@lru_cache(maxsize=8)
+def _schema_key(ref: _SchemaRef) -> str:
+    payload = json.dumps(ref.schema_info, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def get_schema_key(schema_info: Dict[str, Any]) -> str:
+    """
+    Compute a stable hash of database schema information.
+
+    The hash is computed once per schema_info object, so repeated calls with
+    the cached schema are free.
+
+    Args:
+        schema_info: Database schema information
+
+    Returns:
+        Hex digest that changes whenever the schema changes
+    """
+    return _schema_key(_SchemaRef(schema_info))
+
+
+def get_schema_prompt_compact(schema_info: Dict[str, Any]) -> str:
+    """
+    Format schema information compactly as table(column:type, ...).
+
+    NOT NULL columns are marked with a trailing "!".
+
+    Args:
+        schema_info: Database schema information
+
+    Returns:
+        Compact schema description
+    """
+    return "\n".join(chain(
+        ("Database Schema (table(column:type), ! = NOT NULL):",),
+        (
+            f"{table_name}(" + ", ".join(
+                f"{col['name']}:{_SHORT_TYPES.get(col['type'], col['type'])}{'' if col['nullable'] else '!'}"
+                for col in table_info.get("columns", [])
+            ) + ")"
+            for table_name, table_info in schema_info.get("tables", {}).items()
+        )
+    ))
+
+
+@lru_cache(maxsize=8)
+def _schema_prompt(ref: _SchemaRef) -> str:
+    schema_info = ref.schema_info
+    if SCHEMA_FORMAT == "compact":
+        return get_schema_prompt_compact(schema_info)
+    return "\n".join(chain(
+        ("Database Schema:", ""),
+        *(
+            chain(
+                (f"Table: {table_name}",),
+                (
+                    f"  - {col['name']} ({col['type']}) {'NULL' if col['nullable'] else 'NOT NULL'}"
+                    for col in table_info.get("columns", [])
+                ),
+                ("",),
+            )
+            for table_name, table_info in schema_info.get("tables", {}).items()
+        )
+    ))
+
+
 def get_schema_prompt(schema_info: Dict[str, Any]) -> str:
     """
     Format database schema information for the LLM prompt.
 
+    Uses the compact format when SCHEMA_FORMAT=compact. The text is built
+    once per schema_info object, so every prompt for the same schema carries
+    a byte-identical schema block.
+
     Args:
         schema_info: Database schema information
 
     Returns:
         Formatted schema description
     """
-    lines = ["Database Schema:", ""]
+    return _schema_prompt(_SchemaRef(schema_info))
 
-    for table_name, table_info in schema_info.get("tables", {}).items():
-        lines.append(f"Table: {table_name}")
-        for col in table_info.get("columns", []):
-            nullable = "NULL" if col["nullable"] else "NOT NULL"
-            lines.append(f"  - {col['name']} ({col['type']}) {nullable}")
-        lines.append("")
 
-    return "\n".join(lines)
+@lru_cache(maxsize=256)
+def _cached_nl2sql_prompt(question: str, schema_text: str) -> str:
+    """Build the NL2SQL prompt; memoized since retries reuse the same inputs."""
+    return get_nl2sql_prompt(question, schema_text)
 
 
 def create_nl2sql_prompt(question: str, schema_info: Dict[str, Any]) -> str:
@@ -87,7 +264,7 @@ def create_nl2sql_prompt(question: str, schema_info: Dict[str, Any]) -> str:
         Formatted prompt
     """
     schema_text = get_schema_prompt(schema_info)
-    return get_nl2sql_prompt(question, schema_text)
+    return _cached_nl2sql_prompt(question, schema_text)
 
 
 def generate_sql(question: str, schema_info: Dict[str, Any]) -> SQLQuery:
@@ -118,10 +295,179 @@ def generate_sql(question: str, schema_info: Dict[str, Any]) -> SQLQuery:
     return sql_query
 
 
+def is_transient_error(error_message: str) -> bool:
+    """Whether a database error is likely to succeed if the same query is retried."""
+    return bool(_TRANSIENT_ERROR_PATTERN.search(error_message))
+
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff before re-running a query after a transient error."""
+    return 0.1 * 2 ** attempt
+
+
+def format_attempt_history(attempts: List[Dict[str, Any]], total_attempts: int) -> str:
+    """Build the error message listing every failed query attempt."""
+    error_details = f"Query failed after {total_attempts} attempts.\n\n"
+    error_details += "Attempt history:\n"
+    for att in attempts:
+        error_details += f"  Attempt {att['attempt']}: {att['error'][:100]}...\n"
+    return error_details
+
+
+def cached_execute(db_connection, query: str, schema_key: str) -> Dict[str, Any]:
+    """
+    Execute a SELECT query, reusing recent results for the same SQL and schema.
+
+    Caching only applies when RESULT_CACHE_ENABLED is set. Queries containing
+    an @no_cache comment always hit the database. Callers get their own copy
+    of the rows list, so mutating a result never changes the cached entry.
+
+    Args:
+        db_connection: Database connection instance
+        query: SQL SELECT query to execute
+        schema_key: Hash of the current database schema
+
+    Returns:
+        Dictionary with columns, rows, and row_count
+    """
+    if (not RESULT_CACHE_ENABLED or RESULT_CACHE_SIZE <= 0 or RESULT_CACHE_TTL <= 0
+            or NO_CACHE_DIRECTIVE in query):
+        return db_connection.execute_query(query)
+
+    key = (query.strip().rstrip(";").strip(), schema_key)
+    with _result_cache_lock:
+        entry = _result_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < RESULT_CACHE_TTL:
+            _result_cache.move_to_end(key)
+            logger.info("Result cache hit")
+            return _copy_result(entry[1])
+
+    result = db_connection.execute_query(query)
+
+    with _result_cache_lock:
+        _result_cache[key] = (time.monotonic(), result)
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+    return _copy_result(result)
+
+
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a query result along with its rows list."""
+    copied = dict(result)
+    if isinstance(copied.get("rows"), list):
+        copied["rows"] = list(copied["rows"])
+    return copied
+
+
+def _lookup_skeleton_cache(question: str, schema_info: Dict[str, Any]) -> Optional[SQLQuery]:
+    """Return SQL reused from a structurally identical question, if cached."""
+    cache = get_skeleton_cache()
+    if cache is None:
+        return None
+    cached = cache.lookup(question, get_schema_key(schema_info))
+    if cached is None:
+        return None
+    query, explanation, tables_used = cached
+    return SQLQuery(query=query, explanation=explanation, tables_used=tables_used)
+
+
+def _store_skeleton_cache(question: str, schema_info: Dict[str, Any], query: str, explanation: str, tables_used: List[str]) -> None:
+    """Remember SQL that executed successfully for a question."""
+    cache = get_skeleton_cache()
+    if cache is not None:
+        cache.add(question, get_schema_key(schema_info), query, explanation, tables_used)
+
+
+async def agenerate_sql(question: str, schema_info: Dict[str, Any]) -> SQLQuery:
+    """Async version of generate_sql."""
+    logger.info(f"Generating SQL for question: {question}")
+
+    prompt = create_nl2sql_prompt(question, schema_info)
+
+    model = get_model(temperature=0.0)
+    structured_model = model.with_structured_output(SQLQuery)
+
+    async with get_llm_semaphore():
+        sql_query = await structured_model.ainvoke([
+            {"role": "system", "content": SQL_GENERATOR_SYSTEM},
+            {"role": "user", "content": prompt}
+        ])
+
+    logger.info(f"Generated SQL: {sql_query.query}")
+
+    return sql_query
+
+
+def _query_is_complete(partial: Dict[str, Any]) -> bool:
+    """Whether a streamed partial response has finished its query field."""
+    keys = list(partial)
+    return "query" in keys and keys.index("query") < len(keys) - 1
+
+
+async def agenerate_sql_streaming(
+    question: str,
+    schema_info: Dict[str, Any],
+    on_query: Callable[[str], Awaitable[Dict[str, Any]]]
+) -> Tuple[SQLQuery, Optional[asyncio.Task]]:
+    """
+    Generate SQL, starting on_query as soon as the query field is complete.
+
+    The structured response is streamed as partial dicts; once a field after
+    "query" appears, the query can no longer change, so it is handed to
+    on_query (typically database execution) while the explanation and
+    tables are still being generated.
+
+    Args:
+        question: Natural language question
+        schema_info: Database schema information
+        on_query: Coroutine function started with the finished query
+
+    Returns:
+        (generated SQL query, task running on_query for it or None)
+    """
+    logger.info(f"Generating SQL (streaming) for question: {question}")
+
+    prompt = create_nl2sql_prompt(question, schema_info)
+
+    model = get_model(temperature=0.0)
+    structured_model = model.with_structured_output(SQLQuery.model_json_schema())
+
+    partial: Dict[str, Any] = {}
+    task: Optional[asyncio.Task] = None
+    started_query = None
+    handed_off = False
+    try:
+        async with get_llm_semaphore():
+            async for partial in structured_model.astream([
+                {"role": "system", "content": SQL_GENERATOR_SYSTEM},
+                {"role": "user", "content": prompt}
+            ]):
+                if task is None and _query_is_complete(partial):
+                    logger.info("Query complete, executing while the response finishes")
+                    started_query = partial["query"]
+                    task = asyncio.create_task(on_query(started_query))
+
+        sql_query = SQLQuery.model_validate(partial)
+        logger.info(f"Generated SQL: {sql_query.query}")
+
+        # Defensive: never hand back an execution of a different query
+        handed_off = task is not None and started_query == sql_query.query
+        return sql_query, task if handed_off else None
+    finally:
+        # An execution the caller won't await (streaming failed, or the query
+        # changed) is cancelled and awaited here, so it never runs unowned
+        if task is not None and not handed_off:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
 def execute_nl2sql(
     question: str,
     db_connection,
-    max_retries: int = 5
+    max_retries: int = 5,
+    sql_query: Optional[SQLQuery] = None
 ) -> QueryResult:
     """
     Complete NL2SQL pipeline: translate question, execute query, format results.
@@ -132,6 +478,8 @@ def execute_nl2sql(
         question: Natural language question
         db_connection: Database connection instance
         max_retries: Maximum number of retry attempts for failed queries (default: 5)
+        sql_query: Optional pre-generated query (e.g. from generate_sql_batch);
+            generated from the question if not provided
 
     Returns:
         Query result with data and formatted output
@@ -140,22 +488,25 @@ def execute_nl2sql(
 
     try:
         # Get schema information
-        schema_info = db_connection.get_schema_info()
+        schema_info = db_connection.get_cached_schema_info()
 
-        # Generate initial SQL query
-        sql_query = generate_sql(question, schema_info)
+        # Generate initial SQL query (reusing SQL for a same-shaped question if cached)
+        if sql_query is None:
+            sql_query = _lookup_skeleton_cache(question, schema_info) or generate_sql(question, schema_info)
         current_query = sql_query.query
         current_explanation = sql_query.explanation
+        schema_key = get_schema_key(schema_info)
 
         # Track all attempts for debugging
         attempts = []
+        deadline = time.monotonic() + MAX_QUERY_SECONDS
 
         for attempt in range(max_retries + 1):  # +1 for initial attempt
             try:
                 logger.info(f"Executing query (attempt {attempt + 1}/{max_retries + 1}): {current_query[:100]}...")
 
                 # Execute the query
-                result = db_connection.execute_query(current_query)
+                result = cached_execute(db_connection, current_query, schema_key)
 
                 # Format the results
                 formatted = format_results_as_table(result)
@@ -163,11 +514,13 @@ def execute_nl2sql(
                 if attempt > 0:
                     logger.info(f"Query succeeded after {attempt + 1} attempts")
 
+                _store_skeleton_cache(question, schema_info, current_query, current_explanation, sql_query.tables_used)
+
                 return QueryResult(
                     success=True,
                     query=current_query,
                     explanation=current_explanation,
-                    data=result,
+                    data=QueryData.model_construct(**result),
                     formatted_result=formatted,
                     row_count=result["row_count"]
                 )
@@ -182,8 +535,15 @@ def execute_nl2sql(
 
                 logger.warning(f"Query attempt {attempt + 1} failed: {error_msg}")
 
-                # If we have retries left, try to fix the query
-                if attempt < max_retries:
+                # If we have retries and time left, retry transient errors as-is
+                # and ask the LLM to fix everything else
+                if attempt < max_retries and time.monotonic() < deadline:
+                    if is_transient_error(error_msg):
+                        delay = retry_delay(attempt)
+                        logger.info(f"Transient error, re-running query in {delay:.1f}s (retry {attempt + 1}/{max_retries})")
+                        time.sleep(delay)
+                        continue
+
                     logger.info(f"Attempting to fix query (retry {attempt + 1}/{max_retries})...")
                     try:
                         fixed_query = validate_and_fix_sql(
@@ -198,20 +558,14 @@ def execute_nl2sql(
                         logger.error(f"Failed to generate fixed query: {fix_error}")
                         # Continue to next iteration, which will fail if this was the last retry
                 else:
-                    # All retries exhausted
-                    logger.error(f"All {max_retries + 1} attempts failed")
-
-                    # Build detailed error message
-                    error_details = f"Query failed after {max_retries + 1} attempts.\n\n"
-                    error_details += "Attempt history:\n"
-                    for att in attempts:
-                        error_details += f"  Attempt {att['attempt']}: {att['error'][:100]}...\n"
+                    # All retries (or the time budget) exhausted
+                    logger.error(f"All {len(attempts)} attempts failed")
 
                     return QueryResult(
                         success=False,
                         query=current_query,
                         explanation=current_explanation,
-                        error=error_details
+                        error=format_attempt_history(attempts, len(attempts))
                     )
 
         # Should not reach here, but just in case
@@ -232,6 +586,199 @@ def execute_nl2sql(
         )
 
 
+async def aexecute_nl2sql(
+    question: str,
+    db_connection,
+    max_retries: int = 5,
+    schema_info: Optional[Dict[str, Any]] = None
+) -> QueryResult:
+    """
+    Async version of execute_nl2sql.
+
+    LLM calls are awaited and database calls run in a worker thread, so the
+    event loop stays free for other requests while either is in flight.
+
+    Args:
+        question: Natural language question
+        db_connection: Database connection instance
+        max_retries: Maximum number of retry attempts for failed queries (default: 5)
+        schema_info: Optional schema information already fetched by the caller
+
+    Returns:
+        Query result with data and formatted output
+    """
+    from tools.database import format_results_as_table
+
+    try:
+        if schema_info is None:
+            schema_info = await asyncio.to_thread(db_connection.get_cached_schema_info)
+
+        schema_key = get_schema_key(schema_info)
+
+        def run_query(query: str) -> Awaitable[Dict[str, Any]]:
+            return asyncio.to_thread(cached_execute, db_connection, query, schema_key)
+
+        # Generated SQL starts executing as soon as its query text is complete
+        early_execution = None
+        sql_query = _lookup_skeleton_cache(question, schema_info)
+        if sql_query is None:
+            try:
+                sql_query, early_execution = await agenerate_sql_streaming(question, schema_info, run_query)
+            except Exception as stream_error:
+                logger.warning(f"Streaming SQL generation failed, retrying without streaming: {stream_error}")
+                sql_query = await agenerate_sql(question, schema_info)
+        current_query = sql_query.query
+        current_explanation = sql_query.explanation
+
+        attempts = []
+        deadline = time.monotonic() + MAX_QUERY_SECONDS
+
+        for attempt in range(max_retries + 1):
+            try:
+                logger.info(f"Executing query (attempt {attempt + 1}/{max_retries + 1}): {current_query[:100]}...")
+
+                if early_execution is not None:
+                    execution, early_execution = early_execution, None
+                    result = await execution
+                else:
+                    result = await run_query(current_query)
+                formatted = format_results_as_table(result)
+
+                if attempt > 0:
+                    logger.info(f"Query succeeded after {attempt + 1} attempts")
+
+                _store_skeleton_cache(question, schema_info, current_query, current_explanation, sql_query.tables_used)
+
+                return QueryResult(
+                    success=True,
+                    query=current_query,
+                    explanation=current_explanation,
+                    data=QueryData.model_construct(**result),
+                    formatted_result=formatted,
+                    row_count=result["row_count"]
+                )
+
+            except Exception as query_error:
+                error_msg = str(query_error)
+                attempts.append({
+                    "attempt": attempt + 1,
+                    "query": current_query,
+                    "error": error_msg
+                })
+
+                logger.warning(f"Query attempt {attempt + 1} failed: {error_msg}")
+
+                if attempt < max_retries and time.monotonic() < deadline:
+                    if is_transient_error(error_msg):
+                        delay = retry_delay(attempt)
+                        logger.info(f"Transient error, re-running query in {delay:.1f}s (retry {attempt + 1}/{max_retries})")
+                        await asyncio.sleep(delay)
+                        continue
+
+                    logger.info(f"Attempting to fix query (retry {attempt + 1}/{max_retries})...")
+                    try:
+                        fixed_query = await avalidate_and_fix_sql(current_query, error_msg, schema_info)
+                        current_query = fixed_query.query
+                        current_explanation = fixed_query.explanation
+                        logger.info(f"Generated fixed query: {current_query[:100]}...")
+                    except Exception as fix_error:
+                        logger.error(f"Failed to generate fixed query: {fix_error}")
+                else:
+                    logger.error(f"All {len(attempts)} attempts failed")
+                    return QueryResult(
+                        success=False,
+                        query=current_query,
+                        explanation=current_explanation,
+                        error=format_attempt_history(attempts, len(attempts))
+                    )
+
+        return QueryResult(
+            success=False,
+            query=current_query,
+            explanation=current_explanation,
+            error="Query execution failed unexpectedly"
+        )
+
+    except Exception as e:
+        logger.error(f"NL2SQL execution failed: {e}")
+        return QueryResult(
+            success=False,
+            query="",
+            explanation="",
+            error=str(e)
+        )
+
+
+def generate_sql_batch(questions: List[str], schema_info: Dict[str, Any]) -> List[SQLQuery]:
+    """
+    Generate SQL for several questions, MAX_SQL_BATCH_SIZE per LLM call.
+
+    Args:
+        questions: Natural language questions
+        schema_info: Database schema information
+
+    Returns:
+        Generated SQL queries, one per question
+    """
+    schema_text = get_schema_prompt(schema_info)
+    structured_model = get_model(temperature=0.0).with_structured_output(SQLQueryBatch)
+
+    queries = []
+    for start in range(0, len(questions), MAX_SQL_BATCH_SIZE):
+        group = questions[start:start + MAX_SQL_BATCH_SIZE]
+        logger.info(f"Generating SQL for {len(group)} questions in one call")
+
+        try:
+            batch = structured_model.invoke([
+                {"role": "system", "content": SQL_GENERATOR_SYSTEM},
+                {"role": "user", "content": get_nl2sql_batch_prompt(group, schema_text)}
+            ])
+            items = list(batch.items[:len(group)])
+        except Exception as e:
+            logger.warning(f"Batch SQL generation failed, generating individually: {e}")
+            items = []
+
+        # Fall back to individual calls for any questions the model skipped
+        for question in group[len(items):]:
+            items.append(generate_sql(question, schema_info))
+
+        queries.extend(items)
+
+    return queries
+
+
+def execute_nl2sql_batch(
+    questions: List[str],
+    db_connection,
+    max_retries: int = 5
+) -> List[QueryResult]:
+    """
+    Run the NL2SQL pipeline for several questions with batched SQL generation.
+
+    Args:
+        questions: Natural language questions
+        db_connection: Database connection instance
+        max_retries: Maximum number of retry attempts per failed query
+
+    Returns:
+        Query results, one per question
+    """
+    try:
+        schema_info = db_connection.get_cached_schema_info()
+        sql_queries = generate_sql_batch(questions, schema_info)
+    except Exception as e:
+        logger.error(f"Batch NL2SQL generation failed: {e}")
+        return [
+            QueryResult(success=False, query="", explanation="", error=str(e))
+            for _ in questions
+        ]
+
+    return [
+        execute_nl2sql(question, db_connection, max_retries=max_retries, sql_query=sql_query)
+        for question, sql_query in zip(questions, sql_queries)
+    ]
+
+
 def validate_and_fix_sql(
     original_query: str,
     error_message: str,
@@ -258,3 +805,22 @@ def validate_and_fix_sql(
         {"role": "system", "content": SQL_FIXER_SYSTEM},
         {"role": "user", "content": prompt}
     ])
+
+
+async def avalidate_and_fix_sql(
+    original_query: str,
+    error_message: str,
+    schema_info: Dict[str, Any]
+) -> SQLQuery:
+    """Async version of validate_and_fix_sql."""
+    schema_text = get_schema_prompt(schema_info)
+    prompt = get_sql_fix_prompt(original_query, error_message, schema_text)
+
+    model = get_model(temperature=0.0)
+    structured_model = model.with_structured_output(SQLQuery)
+
+    async with get_llm_semaphore():
+        return await structured_model.ainvoke([
+            {"role": "system", "content": SQL_FIXER_SYSTEM},
+            {"role": "user", "content": prompt}
+        ])
@@ -0,0 +1,131 @@
+"""
+Semantic LLM Cache - Embedding-based caching for paraphrased questions.
+
+Complements the exact-match cache in llm_cache.py: when a new question is
+semantically close to one answered before (cosine similarity above a threshold)
+and the data description is identical, the earlier response is reused.
+
+Enable by setting SEMANTIC_CACHE_ENABLED=true. Requires faiss-cpu and
+sentence-transformers.
+"""
+
+import os
+import json
+import atexit
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Type, TypeVar, List, Tuple
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+# Cache configuration
+SEMANTIC_CACHE_ENABLED = os.environ.get("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+SEMANTIC_CACHE_THRESHOLD = float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+CACHE_DIR = Path(__file__).parent.parent / ".semantic_cache"
+
+
+def _hash_context(context: str) -> str:
+    """Hash the exact-match context (e.g. the data description)."""
+    return hashlib.sha1(context.encode()).hexdigest()
+
+
+class SemanticCache:
+    """
+    FAISS-backed cache of structured responses keyed by question embedding.
+
+    Each entry stores the hash of its context alongside the serialized
+    response, so a hit requires both a similar question and an identical context.
+    """
+
+    def __init__(self, threshold: float = SEMANTIC_CACHE_THRESHOLD, cache_dir: Path = CACHE_DIR):
+        import faiss
+        from sentence_transformers import SentenceTransformer
+
+        self.threshold = threshold
+        self.cache_dir = cache_dir
+        self._index_path = cache_dir / "index.faiss"
+        self._entries_path = cache_dir / "entries.json"
+        self._lock = threading.Lock()
+
+        logger.info(f"Loading embedding model: {EMBEDDING_MODEL}")
+        self._encoder = SentenceTransformer(EMBEDDING_MODEL)
+        dimension = self._encoder.get_sentence_embedding_dimension()
+
+        self._entries: List[Tuple[str, str]] = []
+        if self._index_path.exists() and self._entries_path.exists():
+            self._index = faiss.read_index(str(self._index_path))
+            self._entries = [tuple(entry) for entry in json.loads(self._entries_path.read_text())]
+            logger.info(f"Loaded semantic cache with {len(self._entries)} entries")
+        else:
+            self._index = faiss.IndexFlatIP(dimension)
+
+    def _embed(self, text: str):
+        """Encode text as a normalized embedding (inner product == cosine)."""
+        return self._encoder.encode([text], normalize_embeddings=True)
+
+    def lookup(self, question: str, context: str, schema: Type[T]) -> Optional[T]:
+        """
+        Find a cached response for a semantically similar question.
+
+        Args:
+            question: The question being asked
+            context: Context that must match exactly (e.g. data description)
+            schema: Pydantic model to deserialize the cached response into
+
+        Returns:
+            Cached response, or None if nothing is close enough
+        """
+        embedding = self._embed(question)
+        with self._lock:
+            if self._index.ntotal == 0:
+                return None
+            scores, indices = self._index.search(embedding, 1)
+            score, idx = float(scores[0, 0]), int(indices[0, 0])
+            if idx < 0 or score < self.threshold:
+                return None
+            context_hash, value_json = self._entries[idx]
+
+        if context_hash != _hash_context(context):
+            return None
+
+        logger.info(f"Semantic cache hit for {schema.__name__} (similarity={score:.3f})")
+        return schema.model_validate_json(value_json)
+
+    def add(self, question: str, context: str, value: BaseModel) -> None:
+        """Store a response for a question and its context."""
+        embedding = self._embed(question)
+        with self._lock:
+            self._index.add(embedding)
+            self._entries.append((_hash_context(context), value.model_dump_json()))
+
+    def save(self) -> None:
+        """Persist the index and entries to disk."""
+        import faiss
+
+        with self._lock:
+            if not self._entries:
+                return
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            faiss.write_index(self._index, str(self._index_path))
+            self._entries_path.write_text(json.dumps(self._entries))
+        logger.info(f"Saved semantic cache with {len(self._entries)} entries")
+
+
+_semantic_cache: Optional[SemanticCache] = None
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """Get or create the semantic cache (None if disabled)."""
+    global _semantic_cache
+    if not SEMANTIC_CACHE_ENABLED:
+        return None
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache()
+        atexit.register(_semantic_cache.save)
+    return _semantic_cache
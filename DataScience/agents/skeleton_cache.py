@@ -0,0 +1,195 @@
+"""
+Query Skeleton Cache - Reuse generated SQL for structurally identical questions.
+
+Questions are normalized into a skeleton by replacing literal values (quoted
+strings, numbers, and capitalized names such as airport codes) with
+placeholders. "How many flights left JFK in 2023?" and "How many flights left
+LAX in 2024?" share a skeleton, so the SQL generated for the first is reused
+for the second with the values substituted, skipping the LLM call.
+
+A query is only cached when every value from the question appears exactly once
+in the SQL, so substitution is unambiguous. Each slot also records how its
+value appears in the SQL: inside a quoted string (new values are escaped as
+string content) or as a bare number (new values must be numbers). Values
+anywhere else, such as identifiers, are never templated. Entries are keyed by
+schema hash, so schema changes never reuse stale SQL.
+
+Enable by setting SKELETON_CACHE_ENABLED=true in your environment.
+"""
+
+import os
+import re
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Cache configuration
+SKELETON_CACHE_ENABLED = os.environ.get("SKELETON_CACHE_ENABLED", "false").lower() == "true"
+SKELETON_CACHE_SIZE = int(os.environ.get("SKELETON_CACHE_SIZE", "256"))
+
+# Literal values in a question: quoted strings, numbers, and capitalized names
+_LITERAL_PATTERN = re.compile(
+    r"'(?P<single>[^']+)'"
+    r"|\"(?P<double>[^\"]+)\""
+    r"|(?P<num>(?<![\w.])\d+(?:\.\d+)?(?![\w.]))"
+    r"|(?P<name>\b[A-Z][A-Za-z0-9]*\b)"
+)
+
+
+def normalize(question: str) -> Tuple[str, List[str]]:
+    """
+    Split a question into a skeleton and the literal values it contains.
+
+    Args:
+        question: Natural language question
+
+    Returns:
+        (skeleton, slots) where skeleton has values replaced by <str>, <num>,
+        or <name> placeholders and slots lists the values in order
+    """
+    question = " ".join(question.split())
+    slots = []
+
+    def replace(match: re.Match) -> str:
+        # The first word is capitalized as a matter of course, not a name
+        if match.group("name") and match.start() == 0:
+            return match.group(0)
+        kind = match.lastgroup
+        slots.append(match.group(kind))
+        return "<num>" if kind == "num" else "<name>" if kind == "name" else "<str>"
+
+    skeleton = _LITERAL_PATTERN.sub(replace, question)
+    return skeleton.lower(), slots
+
+
+# Quoted strings and quoted identifiers in SQL
+_SQL_QUOTED_PATTERN = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"")
+_SLOT_PATTERN = re.compile(r"\x00(\d+)\x00")
+_NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+
+def _slot_kinds(query_template: str, slot_count: int) -> Optional[List[str]]:
+    """
+    Classify each slot by where it appears in a SQL template.
+
+    Returns:
+        "str" for slots inside a single-quoted string and "num" for bare
+        slots, or None if any slot is inside a quoted identifier
+    """
+    quoted = [(match.start(), match.end(), match.group()[0]) for match in _SQL_QUOTED_PATTERN.finditer(query_template)]
+    kinds = [""] * slot_count
+    for match in _SLOT_PATTERN.finditer(query_template):
+        quote = next((q for start, end, q in quoted if start < match.start() < end), None)
+        if quote == '"':
+            return None
+        kinds[int(match.group(1))] = "str" if quote == "'" else "num"
+    return kinds
+
+
+def _sql_value(value: str, kind: str) -> Optional[str]:
+    """Render a slot value for the SQL, or None if it doesn't fit the slot's kind."""
+    if kind == "num":
+        return value if _NUMBER_PATTERN.fullmatch(value) else None
+    if "\\" in value:
+        return None  # MySQL treats backslashes in strings as escapes
+    return value.replace("'", "''")
+
+
+def _value_pattern(value: str) -> re.Pattern:
+    """Match a slot value in SQL as a whole token (never inside a placeholder)."""
+    return re.compile(rf"(?<![\w.\x00]){re.escape(value)}(?![\w.\x00])")
+
+
+class SkeletonCache:
+    """LRU cache of SQL templates keyed by (question skeleton, schema hash)."""
+
+    def __init__(self, max_size: int = SKELETON_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, str, List[str], List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, question: str, schema_key: str) -> Optional[Tuple[str, str, List[str]]]:
+        """
+        Find cached SQL for a question with the same skeleton.
+
+        Args:
+            question: Natural language question
+            schema_key: Hash of the current database schema
+
+        Returns:
+            (query, explanation, tables_used) with this question's values
+            substituted, or None on a miss
+        """
+        skeleton, slots = normalize(question)
+
+        with self._lock:
+            entry = self._entries.get((skeleton, schema_key))
+            if entry is None:
+                return None
+            self._entries.move_to_end((skeleton, schema_key))
+
+        query_template, explanation_template, tables_used, kinds = entry
+        sql_values = [_sql_value(value, kind) for value, kind in zip(slots, kinds)]
+        if None in sql_values:
+            return None  # A value that doesn't fit its slot is never spliced into SQL
+
+        query = _SLOT_PATTERN.sub(lambda match: sql_values[int(match.group(1))], query_template)
+        explanation = _SLOT_PATTERN.sub(lambda match: slots[int(match.group(1))], explanation_template)
+
+        logger.info(f"Skeleton cache hit for: {skeleton[:100]}")
+        return query, explanation, list(tables_used)
+
+    def add(self, question: str, schema_key: str, query: str, explanation: str, tables_used: List[str]) -> None:
+        """
+        Store SQL for a question if its values can be substituted unambiguously.
+
+        Args:
+            question: Natural language question the SQL answers
+            schema_key: Hash of the current database schema
+            query: SQL that executed successfully
+            explanation: Explanation of the SQL
+            tables_used: Tables referenced by the SQL
+        """
+        skeleton, slots = normalize(question)
+        if not slots or len(set(slots)) != len(slots):
+            return
+
+        query_template = query
+        explanation_template = explanation
+        for i, value in enumerate(slots):
+            pattern = _value_pattern(value)
+            if len(pattern.findall(query_template)) != 1:
+                return
+            query_template = pattern.sub(f"\x00{i}\x00", query_template)
+            explanation_template = pattern.sub(f"\x00{i}\x00", explanation_template)
+
+        kinds = _slot_kinds(query_template, len(slots))
+        if kinds is None or any(_sql_value(value, kind) != value for value, kind in zip(slots, kinds)):
+            return
+
+        with self._lock:
+            self._entries[(skeleton, schema_key)] = (query_template, explanation_template, list(tables_used), kinds)
+            self._entries.move_to_end((skeleton, schema_key))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+_skeleton_cache: Optional[SkeletonCache] = None
+
+
+def get_skeleton_cache() -> Optional[SkeletonCache]:
+    """Get or create the skeleton cache (None if disabled)."""
+    global _skeleton_cache
+    if not SKELETON_CACHE_ENABLED:
+        return None
+    if _skeleton_cache is None:
+        _skeleton_cache = SkeletonCache()
+    return _skeleton_cache
@@ -11,26 +11,39 @@ Uses LangGraph for workflow orchestration and Gradient ADK for deployment.
 """
 
 import os
+import re
+import time
+import asyncio
+import hashlib
 import logging
-from typing import TypedDict, Optional, List, Literal, Annotated
-from pydantic import BaseModel, Field
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from functools import lru_cache
+from itertools import chain
+from typing import TypedDict, Optional, List, Literal, Annotated, Dict, Tuple, AsyncIterator
+from pydantic import BaseModel, ConfigDict, Field
 from langchain_gradient import ChatGradient
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import MemorySaver
 from gradient_adk import entrypoint
 
-from tools.database import DatabaseConnection, get_schema, format_results_as_table
-from agents.nl2sql import execute_nl2sql, QueryResult
-from agents.data_analyst import run_analysis, AnalysisResult
+from tools.database import DatabaseConnection, get_database, format_results_as_table
+from agents.nl2sql import aexecute_nl2sql, execute_nl2sql_batch, get_llm_semaphore, get_schema_key, QueryResult
+from agents.data_analyst import run_analysis_async, encode_image_file, AnalysisResult
 
 # Import prompts - edit prompts.py to customize agent behavior
 from prompts import (
     get_intent_classification_prompt,
+    get_intent_label_prompt,
+    get_intent_batch_label_prompt,
     INTENT_CLASSIFIER_SYSTEM,
     QUERY_SUMMARIZER_SYSTEM,
     get_query_summary_prompt,
     ANALYSIS_SUMMARIZER_SYSTEM,
     get_analysis_summary_prompt,
+    CHART_CAPTION_SYSTEM,
+    get_chart_caption_prompt,
 )
 
 # Configure logging
@@ -40,17 +53,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Model configuration
-MODEL = "openai-gpt-4.1"
+# Model configuration: a smaller model for intent classification and summaries.
+# SQL generation (agents/nl2sql.py) and analysis code use the full model.
+SMALL_MODEL = os.environ.get("SMALL_MODEL", "openai-gpt-4.1-mini")
 
 # Query retry configuration
 DEFAULT_MAX_QUERY_RETRIES = 5
 
+# Caption generated charts (written concurrently with the analysis summary)
+CHART_CAPTIONS_ENABLED = os.environ.get("CHART_CAPTIONS_ENABLED", "true").lower() == "true"
 
-def get_model(temperature: float = 0.0) -> ChatGradient:
-    """Get a ChatGradient instance."""
+
+@lru_cache(maxsize=None)
+def get_small_model(temperature: float = 0.0) -> ChatGradient:
+    """Get a shared ChatGradient instance for short classification and summary tasks."""
     return ChatGradient(
-        model=MODEL,
+        model=SMALL_MODEL,
         temperature=temperature
     )
 
@@ -60,14 +78,23 @@ def get_model(temperature: float = 0.0) -> ChatGradient:
 # =============================================================================
 
 class ImageData(BaseModel):
-    """Image data for visualizations."""
-    base64_data: str = Field(description="Base64 encoded image data")
-    file_path: Optional[str] = Field(default=None, description="Path to saved image file")
+    """Image data for visualizations (base64 is read from the file on demand)."""
+    model_config = ConfigDict(extra="forbid")
+
+    file_path: str = Field(description="Path to saved image file")
     mime_type: str = Field(default="image/png", description="Image MIME type")
+    caption: Optional[str] = Field(default=None, description="Short description of the chart")
+
+    @property
+    def base64_data(self) -> str:
+        """Base64 encoded image data."""
+        return encode_image_file(Path(self.file_path))
 
 
 class AgentResponse(BaseModel):
     """Final response from the agent."""
+    model_config = ConfigDict(extra="forbid")
+
     summary: str = Field(description="Text summary/explanation for the user")
     sql_query: Optional[str] = Field(default=None, description="SQL query that was executed")
     data_table: Optional[str] = Field(default=None, description="Formatted data table")
@@ -77,7 +104,12 @@ class AgentResponse(BaseModel):
 
 
 class DataScienceState(TypedDict, total=False):
-    """State for the data science workflow."""
+    """
+    State for the data science workflow.
+
+    Nodes return only the keys they update; LangGraph merges them into the
+    current state, so large values like query_data are never copied.
+    """
     # Input
     message: str
 
@@ -91,7 +123,7 @@ class DataScienceState(TypedDict, total=False):
     # Database (schema_info is serializable, connection is created on demand)
     schema_info: Optional[dict]
 
-    # Query execution
+    # Query execution (rows live only in query_data, not also on query_result)
     query_result: Optional[QueryResult]
     query_data: Optional[dict]
 
@@ -103,17 +135,72 @@ class DataScienceState(TypedDict, total=False):
     error: Optional[str]
 
 
-# Module-level database connection (not stored in state)
-_db_connection: Optional[DatabaseConnection] = None
+def get_db_connection() -> DatabaseConnection:
+    """
+    Get the process-wide pooled database connection (not stored in state).
 
+    The pool is created on first use and reused by every later request;
+    nodes borrow connections from it per query.
+    """
+    db = get_database()
+    db.connect()
+    return db
 
-def get_db_connection() -> DatabaseConnection:
-    """Get or create the database connection."""
-    global _db_connection
-    if _db_connection is None:
-        _db_connection = DatabaseConnection()
-        _db_connection.connect()
-    return _db_connection
+
+# Finished responses by normalized message and schema, so repeated questions
+# skip the whole workflow. Off by default: answers may be up to TTL seconds old.
+RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", "1000"))
+RESPONSE_CACHE_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", "600"))
+_response_cache: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache_key(message: str) -> Optional[str]:
+    """
+    Build the response cache key for a message.
+
+    Messages are compared lowercased, with collapsed whitespace and without
+    trailing "?" or ".", together with the current schema hash so schema
+    changes never serve old answers. Other punctuation is kept, since
+    operators and signs ("> 30" vs "< 30") change the answer.
+
+    Returns:
+        Cache key, or None if the message must not be cached
+    """
+    lowered = message.lower()
+    if "@no_cache" in lowered or "refresh" in lowered:
+        return None
+    try:
+        schema_key = get_schema_key(get_db_connection().get_cached_schema_info())
+    except Exception as e:
+        logger.warning("Response cache disabled for this request: %s", e)
+        return None
+    normalized = " ".join(lowered.split()).rstrip("?. ")
+    return hashlib.blake2b(f"{schema_key}:{normalized}".encode(), digest_size=16).hexdigest()
+
+
+def get_cached_response(key: str) -> Optional[dict]:
+    """Get a cached response if it has not expired."""
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        cached_at, output = entry
+        if time.monotonic() - cached_at >= RESPONSE_CACHE_TTL:
+            del _response_cache[key]
+            return None
+        _response_cache.move_to_end(key)
+        return output
+
+
+def set_cached_response(key: str, output: dict) -> None:
+    """Cache a successful response, evicting the least recently used."""
+    with _response_cache_lock:
+        _response_cache[key] = (time.monotonic(), output)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
 
 
 # =============================================================================
@@ -122,33 +209,248 @@ def get_db_connection() -> DatabaseConnection:
 
 class UserIntent(BaseModel):
     """Classified user intent."""
+    model_config = ConfigDict(extra="forbid")
+
     intent: Literal["query", "analyze", "visualize", "schema", "help"]
     needs_visualization: bool = Field(description="Whether the request needs a chart or graph")
     rephrased_question: str = Field(description="Clear question for processing")
 
 
-def classify_intent(state: DataScienceState) -> DataScienceState:
-    """Classify the user's intent from their message."""
-    message = state["message"]
-    logger.info(f"Classifying intent for: {message[:100]}...")
+# Messages whose intent is obvious enough to skip the LLM, checked in order:
+# (pattern, label). Labels are keys of INTENT_LABELS. Each pattern matches a
+# whole message, so requests with anything more ("..., then plot it") go to
+# the classifier.
+_INTENT_PATTERNS = [
+    (re.compile(r"^\s*(help|what can you do)\s*[?.!]*\s*$", re.IGNORECASE), "help"),
+    (re.compile(
+        r"^\s*(schema|show (me )?(the )?(tables|schema)|list (the |all )?tables"
+        r"|(what|which) tables (are there|exist|do you have|are in the database))\s*[?.!]*\s*$",
+        re.IGNORECASE
+    ), "schema"),
+    (re.compile(
+        r"^\s*(plot|chart|graph|visuali[sz]e|(show|make|draw|create)( me)? an? (plot|chart|graph|histogram) of)"
+        r"(?![^\n]*\b(then|and also)\b)[\w\s,'-]+[.!]?\s*$",
+        re.IGNORECASE
+    ), "visualize"),
+    (re.compile(
+        r"^\s*(show|list)( me)? all (?!(the )?(tables|columns|schema)\b)"
+        r"(?![^\n]*\b(plot|chart|graph|visuali[sz]e|histogram|then)\b)[\w\s,'-]+[.!]?\s*$",
+        re.IGNORECASE
+    ), "query"),
+]
+
+
+# Intent labels returned by the classifier: label -> (intent, needs_visualization)
+INTENT_LABELS = {
+    "query": ("query", False),
+    "analyze": ("analyze", False),
+    "visualize": ("visualize", True),
+    "schema": ("schema", False),
+    "help": ("help", False),
+    "query+viz": ("query", True),
+}
+
+# Recent classifications by message hash, so retried messages skip the LLM
+INTENT_CACHE_TTL = 300
+INTENT_CACHE_SIZE = 1024
+_intent_cache: Dict[str, Tuple[float, str, bool, str]] = {}
+
+
+# Coalesce classifications from concurrent requests into one LLM call
+INTENT_BATCH_ENABLED = os.environ.get("INTENT_BATCH_ENABLED", "false").lower() == "true"
+INTENT_BATCH_SIZE = int(os.environ.get("INTENT_BATCH_SIZE", "16"))
+INTENT_BATCH_WAIT_MS = int(os.environ.get("INTENT_BATCH_WAIT_MS", "20"))
+
+_BATCH_LABEL_PATTERN = re.compile(r"^\s*(\d+)[.):]\s*(\S+)", re.MULTILINE)
+
+
+def _parse_label(text: str) -> str:
+    """Normalize a label from the classifier's reply."""
+    return text.strip().strip('".').lower()
+
+
+async def _request_label(message: str) -> str:
+    """Ask the small model for a single intent label."""
+    model = get_small_model(temperature=0.0)
+    async with get_llm_semaphore():
+        response = await model.bind(max_tokens=8).ainvoke([
+            {"role": "system", "content": INTENT_CLASSIFIER_SYSTEM},
+            {"role": "user", "content": get_intent_label_prompt(message)}
+        ])
+    return _parse_label(response.content)
+
+
+class IntentBatcher:
+    """
+    Micro-batcher for intent labels.
+
+    Messages submitted within INTENT_BATCH_WAIT_MS of each other (up to
+    INTENT_BATCH_SIZE) are labelled with a single LLM call, and each caller
+    receives its own label through a future. Unparseable labels come back
+    as empty strings so callers fall back to structured classification.
+    """
+
+    def __init__(self, max_batch_size: int = INTENT_BATCH_SIZE, max_wait_ms: int = INTENT_BATCH_WAIT_MS):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._pending = set()  # In-flight batch tasks (keeps references alive)
+
+    async def submit(self, message: str) -> str:
+        """Queue a message and wait for its label."""
+        future = self.loop.create_future()
+        self._queue.put_nowait((message, future))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        return await future
+
+    async def _run(self) -> None:
+        """Collect batches from the queue and label each in the background."""
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self.loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - self.loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            task = asyncio.create_task(self._label_batch(batch))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _label_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Label a batch with one LLM call and resolve each caller's future."""
+        messages = [" ".join(message.split()) for message, _ in batch]
+        try:
+            if len(batch) == 1:
+                labels = [await _request_label(messages[0])]
+            else:
+                logger.info("Classifying %d messages in one call", len(batch))
+                model = get_small_model(temperature=0.0)
+                async with get_llm_semaphore():
+                    response = await model.bind(max_tokens=8 * len(batch)).ainvoke([
+                        {"role": "system", "content": INTENT_CLASSIFIER_SYSTEM},
+                        {"role": "user", "content": get_intent_batch_label_prompt(messages)}
+                    ])
+                by_number = {
+                    int(number): _parse_label(label)
+                    for number, label in _BATCH_LABEL_PATTERN.findall(response.content)
+                }
+                labels = [by_number.get(i, "") for i in range(1, len(batch) + 1)]
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), label in zip(batch, labels):
+            if not future.done():
+                future.set_result(label)
+
+
+_intent_batcher: Optional[IntentBatcher] = None
+
+
+def get_intent_batcher() -> IntentBatcher:
+    """Get or create the intent batcher for the running event loop."""
+    global _intent_batcher
+    if _intent_batcher is None or _intent_batcher.loop is not asyncio.get_running_loop():
+        _intent_batcher = IntentBatcher()
+    return _intent_batcher
+
+
+def _fast_intent(message: str) -> Optional[str]:
+    """Return the intent label for an obvious message, or None if the LLM is needed."""
+    for pattern, label in _INTENT_PATTERNS:
+        if pattern.search(message):
+            return label
+    return None
+
+
+async def _classify_message(message: str) -> Tuple[str, bool, str]:
+    """
+    Classify a message as (intent, needs_visualization, question).
 
-    prompt = get_intent_classification_prompt(message)
+    Asks for a single label first, which needs only a few output tokens, and
+    falls back to structured output if the reply isn't a known label.
+    """
+    key = hashlib.sha1(message.encode()).hexdigest()
+    cached = _intent_cache.get(key)
+    if cached is not None and time.monotonic() - cached[0] < INTENT_CACHE_TTL:
+        return cached[1:]
+
+    if INTENT_BATCH_ENABLED:
+        label = await get_intent_batcher().submit(message)
+    else:
+        label = await _request_label(message)
+
+    if label in INTENT_LABELS:
+        intent, needs_visualization = INTENT_LABELS[label]
+        result = (intent, needs_visualization, message)
+    else:
+        logger.warning("Unrecognized intent label %r, using structured classification", label)
+        structured_model = get_small_model(temperature=0.0).with_structured_output(UserIntent)
+        async with get_llm_semaphore():
+            intent = await structured_model.ainvoke([
+                {"role": "system", "content": INTENT_CLASSIFIER_SYSTEM},
+                {"role": "user", "content": get_intent_classification_prompt(message)}
+            ])
+        result = (
+            intent.intent,
+            intent.needs_visualization or intent.intent == "visualize",
+            intent.rephrased_question
+        )
 
-    model = get_model(temperature=0.0)
-    structured_model = model.with_structured_output(UserIntent)
+    if len(_intent_cache) >= INTENT_CACHE_SIZE:
+        _intent_cache.clear()
+    _intent_cache[key] = (time.monotonic(), *result)
+    return result
 
-    intent = structured_model.invoke([
-        {"role": "system", "content": INTENT_CLASSIFIER_SYSTEM},
-        {"role": "user", "content": prompt}
-    ])
 
-    logger.info(f"Classified intent: {intent.intent}, needs_visualization: {intent.needs_visualization}")
+def _prefetch_schema_info() -> Optional[dict]:
+    """Fetch schema info, returning None on failure (connect_database reports errors)."""
+    try:
+        return get_db_connection().get_cached_schema_info()
+    except Exception as e:
+        logger.warning("Schema prefetch failed: %s", e)
+        return None
+
+
+async def classify_intent(state: DataScienceState) -> DataScienceState:
+    """
+    Classify the user's intent from their message.
+
+    The database schema is fetched in a thread while the LLM classifies,
+    so connect_database usually finds it already in state.
+    """
+    message = state["message"]
+    logger.info("Classifying intent for: %.100s...", message)
+
+    # Fast path for obvious requests (connect_database fetches the schema)
+    label = _fast_intent(message)
+    if label is not None:
+        intent, needs_visualization = INTENT_LABELS[label]
+        logger.info("Classified intent: %s, needs_visualization: %s (pattern match)", intent, needs_visualization)
+        return {"intent": intent, "needs_visualization": needs_visualization}
+
+    (intent, needs_visualization, question), schema_info = await asyncio.gather(
+        _classify_message(message),
+        asyncio.to_thread(_prefetch_schema_info)
+    )
+
+    logger.info("Classified intent: %s, needs_visualization: %s", intent, needs_visualization)
 
     return {
-        **state,
-        "intent": intent.intent,
-        "needs_visualization": intent.needs_visualization or intent.intent == "visualize",
-        "message": intent.rephrased_question
+        "intent": intent,
+        "needs_visualization": needs_visualization,
+        "message": question,
+        "schema_info": schema_info
     }
 
 
@@ -156,67 +458,70 @@ def classify_intent(state: DataScienceState) -> DataScienceState:
 # Database Operations
 # =============================================================================
 
-def connect_database(state: DataScienceState) -> DataScienceState:
+async def connect_database(state: DataScienceState) -> DataScienceState:
     """Connect to the database and get schema info."""
     logger.info("Connecting to database...")
 
     try:
-        db = get_db_connection()
-        schema_info = db.get_schema_info()
+        schema_info = state.get("schema_info")
+        if not schema_info:
+            db = await asyncio.to_thread(get_db_connection)
+            schema_info = await asyncio.to_thread(db.get_cached_schema_info)
 
-        logger.info(f"Connected. Found {len(schema_info.get('tables', {}))} tables")
+        logger.info("Connected. Found %d tables", len(schema_info.get("tables", {})))
 
         return {
-            **state,
             "schema_info": schema_info
         }
     except Exception as e:
-        logger.error(f"Database connection failed: {e}")
+        logger.error("Database connection failed: %s", e)
         return {
-            **state,
             "error": f"Failed to connect to database: {str(e)}"
         }
 
 
-def execute_query(state: DataScienceState) -> DataScienceState:
+async def execute_query(state: DataScienceState) -> DataScienceState:
     """Execute NL2SQL query with automatic retry on failure."""
     message = state["message"]
     max_retries = state.get("max_query_retries", DEFAULT_MAX_QUERY_RETRIES)
 
     try:
-        db = get_db_connection()
+        db = await asyncio.to_thread(get_db_connection)
     except Exception as e:
-        return {**state, "error": f"No database connection: {str(e)}"}
+        return {"error": f"No database connection: {str(e)}"}
 
-    logger.info(f"Executing NL2SQL for: {message[:100]}... (max retries: {max_retries})")
+    logger.info("Executing NL2SQL for: %.100s... (max retries: %d)", message, max_retries)
 
-    result = execute_nl2sql(message, db, max_retries=max_retries)
+    result = await aexecute_nl2sql(
+        message,
+        db,
+        max_retries=max_retries,
+        schema_info=state.get("schema_info")
+    )
 
     if result.success:
-        logger.info(f"Query returned {result.row_count} rows")
+        logger.info("Query returned %d rows", result.row_count)
         return {
-            **state,
-            "query_result": result,
-            "query_data": result.data
+            "query_result": result.model_copy(update={"data": None}),
+            "query_data": dict(result.data)
         }
     else:
-        logger.error(f"Query failed after retries: {result.error}")
+        logger.error("Query failed after retries: %s", result.error)
         return {
-            **state,
             "query_result": result,
             "error": result.error
         }
 
 
-def run_data_analysis(state: DataScienceState) -> DataScienceState:
+async def run_data_analysis(state: DataScienceState) -> DataScienceState:
     """Run data analysis with Python code."""
     message = state["message"]
     query_data = state.get("query_data")
-    schema_info = state.get("schema_info", {})
+    schema_info = state.get("schema_info") or {}
 
     if not query_data:
         logger.warning("No query data available for analysis")
-        return {**state, "error": "No data available for analysis. Please query data first."}
+        return {"error": "No data available for analysis. Please query data first."}
 
     # Create data description
     data_description = f"""
@@ -227,12 +532,11 @@ Current data from query:
 - Row count: {query_data.get('row_count', 0)}
 """
 
-    logger.info(f"Running analysis: {message[:100]}...")
+    logger.info("Running analysis: %.100s...", message)
 
-    result = run_analysis(message, query_data, data_description)
+    result = await run_analysis_async(message, query_data, data_description)
 
     return {
-        **state,
         "analysis_result": result
     }
 
@@ -241,32 +545,58 @@ Current data from query:
 # Response Generation
 # =============================================================================
 
-def generate_schema_response(state: DataScienceState) -> DataScienceState:
+# Nodes whose LLM tokens are forwarded by stream_response
+SUMMARY_NODES = {"generate_query_response", "generate_analysis_response"}
+
+
+async def stream_summary(system: str, prompt: str) -> str:
+    """
+    Generate a summary by streaming tokens from the small model.
+
+    Tokens surface through LangGraph's "messages" stream mode as they are
+    produced; the full text is returned for the structured response.
+    """
+    model = get_small_model(temperature=0.3)
+    chunks = []
+    async with get_llm_semaphore():
+        async for chunk in model.astream([
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ]):
+            chunks.append(chunk.content)
+    return "".join(chunks)
+
+
+async def generate_schema_response(state: DataScienceState) -> DataScienceState:
     """Generate response for schema queries."""
-    # Fetch schema directly from database
+    # Fetch schema from the database ("refresh" in the request bypasses the cache)
+    refresh = "refresh" in state.get("message", "").lower()
     try:
-        db = get_db_connection()
-        schema_info = db.get_schema_info()
+        db = await asyncio.to_thread(get_db_connection)
+        schema_info = await asyncio.to_thread(db.get_cached_schema_info, refresh)
     except Exception as e:
         return {
-            **state,
             "response": AgentResponse(
                 summary=f"Failed to get schema: {str(e)}",
                 error=str(e)
             )
         }
 
-    lines = ["**Database Schema**\n"]
-    for table_name, table_info in schema_info.get("tables", {}).items():
-        lines.append(f"\n**{table_name}**")
-        for col in table_info.get("columns", []):
-            nullable = "(nullable)" if col["nullable"] else ""
-            lines.append(f"  - `{col['name']}` {col['type']} {nullable}")
-
-    summary = "\n".join(lines)
+    summary = "\n".join(chain(
+        ("**Database Schema**\n",),
+        *(
+            chain(
+                (f"\n**{table_name}**",),
+                (
+                    f"  - `{col['name']}` {col['type']} {'(nullable)' if col['nullable'] else ''}"
+                    for col in table_info.get("columns", [])
+                ),
+            )
+            for table_name, table_info in schema_info.get("tables", {}).items()
+        )
+    ))
 
     return {
-        **state,
         "response": AgentResponse(summary=summary)
     }
 
@@ -303,18 +633,16 @@ The database contains airline data including:
 Just ask your question in plain English!"""
 
     return {
-        **state,
         "response": AgentResponse(summary=summary)
     }
 
 
-def generate_query_response(state: DataScienceState) -> DataScienceState:
+async def generate_query_response(state: DataScienceState) -> DataScienceState:
     """Generate response for query results."""
     query_result = state.get("query_result")
 
     if not query_result:
         return {
-            **state,
             "response": AgentResponse(
                 summary="No query was executed.",
                 error=state.get("error")
@@ -323,7 +651,6 @@ def generate_query_response(state: DataScienceState) -> DataScienceState:
 
     if not query_result.success:
         return {
-            **state,
             "response": AgentResponse(
                 summary=f"Query failed: {query_result.error}",
                 error=query_result.error
@@ -338,16 +665,9 @@ def generate_query_response(state: DataScienceState) -> DataScienceState:
         formatted_result=query_result.formatted_result
     )
 
-    model = get_model(temperature=0.3)
-    response = model.invoke([
-        {"role": "system", "content": QUERY_SUMMARIZER_SYSTEM},
-        {"role": "user", "content": prompt}
-    ])
-
-    summary = response.content
+    summary = await stream_summary(QUERY_SUMMARIZER_SYSTEM, prompt)
 
     return {
-        **state,
         "response": AgentResponse(
             summary=summary,
             sql_query=query_result.query,
@@ -356,33 +676,56 @@ def generate_query_response(state: DataScienceState) -> DataScienceState:
     }
 
 
-def generate_analysis_response(state: DataScienceState) -> DataScienceState:
+async def caption_charts(question: str, analysis_result: AnalysisResult) -> Optional[str]:
+    """
+    Caption the charts from an analysis using the small model.
+
+    The call is tagged "nostream" so its tokens are not forwarded as
+    summary tokens by stream_response.
+    """
+    if not CHART_CAPTIONS_ENABLED or not analysis_result.image_paths:
+        return None
+
+    model = get_small_model(temperature=0.0)
+    prompt = get_chart_caption_prompt(question, analysis_result.explanation, analysis_result.code)
+    try:
+        async with get_llm_semaphore():
+            response = await model.ainvoke(
+                [
+                    {"role": "system", "content": CHART_CAPTION_SYSTEM},
+                    {"role": "user", "content": prompt}
+                ],
+                config={"tags": ["nostream"]}
+            )
+        return response.content.strip()
+    except Exception as e:
+        logger.warning("Chart captioning failed: %s", e)
+        return None
+
+
+def build_images(analysis_result: AnalysisResult, caption: Optional[str] = None) -> List[ImageData]:
+    """Describe each chart saved by an analysis."""
+    return [
+        ImageData(file_path=image_path, caption=caption)
+        for image_path in analysis_result.image_paths
+    ]
+
+
+async def generate_analysis_response(state: DataScienceState) -> DataScienceState:
     """Generate response for analysis results."""
     analysis_result = state.get("analysis_result")
     query_result = state.get("query_result")
 
     if not analysis_result:
         return {
-            **state,
             "response": AgentResponse(
                 summary="Analysis could not be completed.",
                 error=state.get("error")
             )
         }
 
-    # Prepare images
-    images = []
-    if analysis_result.images:
-        for i, img_data in enumerate(analysis_result.images):
-            image_path = analysis_result.image_paths[i] if i < len(analysis_result.image_paths) else None
-            images.append(ImageData(
-                base64_data=img_data,
-                file_path=image_path
-            ))
-
     if not analysis_result.success:
         return {
-            **state,
             "response": AgentResponse(
                 summary=f"Analysis failed: {analysis_result.error}",
                 error=analysis_result.error,
@@ -390,24 +733,22 @@ def generate_analysis_response(state: DataScienceState) -> DataScienceState:
             )
         }
 
-    # Generate summary
+    # Summary and chart caption are independent LLM calls, so run them together
+    question = state.get('message', '')
     prompt = get_analysis_summary_prompt(
-        question=state.get('message', ''),
+        question=question,
         explanation=analysis_result.explanation,
         output=analysis_result.output,
-        has_visualization=bool(images)
+        has_visualization=bool(analysis_result.image_paths)
     )
 
-    model = get_model(temperature=0.3)
-    response = model.invoke([
-        {"role": "system", "content": ANALYSIS_SUMMARIZER_SYSTEM},
-        {"role": "user", "content": prompt}
-    ])
-
-    summary = response.content
+    summary, caption = await asyncio.gather(
+        stream_summary(ANALYSIS_SUMMARIZER_SYSTEM, prompt),
+        caption_charts(question, analysis_result)
+    )
+    images = build_images(analysis_result, caption)
 
     return {
-        **state,
         "response": AgentResponse(
             summary=summary,
             sql_query=query_result.query if query_result else None,
@@ -422,7 +763,6 @@ def handle_error(state: DataScienceState) -> DataScienceState:
     error = state.get("error", "An unknown error occurred")
 
     return {
-        **state,
         "response": AgentResponse(
             summary=f"I encountered an error: {error}",
             error=error
@@ -531,24 +871,137 @@ def create_workflow():
     return workflow
 
 
-workflow = create_workflow()
-app = workflow.compile()
+@lru_cache(maxsize=1)
+def get_app():
+    """
+    Compile the workflow on first use and reuse it for every request.
+
+    Importing main (e.g. for stream_response or in tooling) no longer pays
+    for graph construction and validation until a request actually runs.
+    """
+    return create_workflow().compile()
 
 
 # =============================================================================
 # Entrypoint
 # =============================================================================
 
+# Optional text fields copied into the output when set, in output order
+_RESPONSE_FIELDS = ("sql_query", "data_table", "analysis_code")
+
+
+def format_output(result: dict) -> dict:
+    """Convert the final workflow state into the entrypoint response."""
+    response = result.get("response")
+
+    if response:
+        output = {
+            "summary": response.summary,
+            "success": response.error is None,
+            **{
+                name: getattr(response, name)
+                for name in _RESPONSE_FIELDS
+                if getattr(response, name, None)
+            }
+        }
+
+        if response.images:
+            output["images"] = [
+                {"path": img.file_path, "mime_type": img.mime_type, "caption": img.caption}
+                for img in response.images
+            ]
+
+        if response.error:
+            output["error"] = response.error
+
+        return output
+
+    return {
+        "summary": "Unable to process request",
+        "success": False,
+        "error": result.get("error", "Unknown error")
+    }
+
+
+def inline_images(output: dict) -> dict:
+    """Return a copy of a response with each image's base64 data included."""
+    if not output.get("images"):
+        return output
+    return {
+        **output,
+        "images": [
+            {**image, "base64": encode_image_file(Path(image["path"]))}
+            for image in output["images"]
+        ]
+    }
+
+
+# Single-node responses that don't need the workflow: label -> node
+DIRECT_RESPONSES = {
+    "schema": generate_schema_response,
+    "help": generate_help_response,
+}
+
+
+async def run_direct_response(message: str) -> Optional[dict]:
+    """
+    Answer obvious schema and help requests without running the workflow.
+
+    Returns:
+        Response dictionary, or None if the message needs the full workflow
+    """
+    node = DIRECT_RESPONSES.get(_fast_intent(message))
+    if node is None:
+        return None
+    logger.info("Answering directly with %s", node.__name__)
+    update = node({"message": message})
+    if asyncio.iscoroutine(update):
+        update = await update
+    return format_output(update)
+
+
+def run_query_batch(questions: List[str], max_query_retries: int) -> dict:
+    """
+    Answer several data questions with batched SQL generation.
+
+    Skips intent classification and summarization: each question is
+    translated (several per LLM call), executed, and returned as a table.
+    """
+    logger.info("Processing batch of %d questions", len(questions))
+
+    db = get_db_connection()
+    results = execute_nl2sql_batch(questions, db, max_retries=max_query_retries)
+
+    return {
+        "results": [
+            {
+                "question": question,
+                "success": result.success,
+                "sql_query": result.query,
+                "data_table": result.formatted_result,
+                "row_count": result.row_count,
+                "error": result.error
+            }
+            for question, result in zip(questions, results)
+        ]
+    }
+
+
 @entrypoint
-def main(input: dict) -> dict:
+async def main(input: dict) -> dict:
     """
     Data Science Agent entrypoint.
 
     Args:
         input: Dictionary with:
             - message: User's natural language question or request
+            - questions: Optional list of data questions to answer as a batch
+              (returns {"results": [...]} with one SQL result per question)
             - thread_id: Optional thread ID for conversation continuity
             - max_query_retries: Optional max retries for failed SQL queries (default: 5)
+            - inline_images: Optional flag to include base64 image data alongside
+              each image path (default: True). Image paths point to files on
+              the agent host, so only local callers should turn this off.
 
     Returns:
         Response dictionary with summary, data, and any visualizations
@@ -556,6 +1009,10 @@ def main(input: dict) -> dict:
     message = input.get("message", "")
     max_query_retries = input.get("max_query_retries", DEFAULT_MAX_QUERY_RETRIES)
 
+    # Batch mode: {"questions": ["...", "..."]}
+    if input.get("questions"):
+        return await asyncio.to_thread(run_query_batch, input["questions"], max_query_retries)
+
     if not message:
         return {
             "summary": "No message provided",
@@ -563,53 +1020,67 @@ def main(input: dict) -> dict:
             "error": "Input must include a 'message' key"
         }
 
-    logger.info(f"Processing request: {message[:100]}...")
+    logger.info("Processing request: %.100s...", message)
+
+    direct = await run_direct_response(message)
+    if direct is not None:
+        return direct
+
+    cache_key = None
+    if RESPONSE_CACHE_ENABLED:
+        cache_key = await asyncio.to_thread(get_response_cache_key, message)
+        cached = get_cached_response(cache_key) if cache_key else None
+        if cached is not None:
+            logger.info("Response cache hit")
+            return inline_images(cached) if input.get("inline_images", True) else cached
 
     # Run the workflow
     initial_state = {
         "message": message,
         "max_query_retries": max_query_retries
     }
-    result = app.invoke(initial_state)
-
-    # Extract response
-    response = result.get("response")
+    result = await get_app().ainvoke(initial_state)
 
-    if response:
-        output = {
-            "summary": response.summary,
-            "success": response.error is None
-        }
+    output = format_output(result)
+    if cache_key and output["success"]:
+        set_cached_response(cache_key, output)
+    return inline_images(output) if input.get("inline_images", True) else output
 
-        if response.sql_query:
-            output["sql_query"] = response.sql_query
 
-        if response.data_table:
-            output["data_table"] = response.data_table
+async def stream_response(input: dict) -> AsyncIterator[dict]:
+    """
+    Run the workflow and stream the summary as it is generated.
 
-        if response.analysis_code:
-            output["analysis_code"] = response.analysis_code
+    Yields {"type": "token", "content": ...} events for summary tokens, then
+    one {"type": "result", "output": ...} event with the same output main()
+    returns. Use main() when streaming isn't needed.
+    """
+    message = input.get("message", "")
+    if not message:
+        yield {"type": "result", "output": await main(input)}
+        return
 
-        if response.images:
-            output["images"] = [
-                {
-                    "base64": img.base64_data,
-                    "path": img.file_path,
-                    "mime_type": img.mime_type
-                }
-                for img in response.images
-            ]
+    direct = await run_direct_response(message)
+    if direct is not None:
+        yield {"type": "result", "output": direct}
+        return
 
-        if response.error:
-            output["error"] = response.error
+    initial_state = {
+        "message": message,
+        "max_query_retries": input.get("max_query_retries", DEFAULT_MAX_QUERY_RETRIES)
+    }
 
-        return output
+    final_state = {}
+    async for mode, event in get_app().astream(initial_state, stream_mode=["messages", "values"]):
+        if mode == "messages":
+            chunk, metadata = event
+            if metadata.get("langgraph_node") in SUMMARY_NODES and chunk.content:
+                yield {"type": "token", "content": chunk.content}
+        else:
+            final_state = event
 
-    return {
-        "summary": "Unable to process request",
-        "success": False,
-        "error": result.get("error", "Unknown error")
-    }
+    output = format_output(final_state)
+    yield {"type": "result", "output": inline_images(output) if input.get("inline_images", True) else output}
 
 
 if __name__ == "__main__":
@@ -621,7 +1092,7 @@ if __name__ == "__main__":
     else:
         question = "What tables are in the database?"
 
-    result = main({"message": question})
+    result = asyncio.run(main({"message": question}))
     print("\n" + "=" * 60)
     print("RESULT")
     print("=" * 60)
@@ -41,38 +41,101 @@ Rephrase the question clearly for processing."""
 INTENT_CLASSIFIER_SYSTEM = "You classify user intent for a data science agent."
 
 
+INTENT_LABELS_TEXT = """Labels:
+- query: retrieve data from the database (e.g., "show me all flights", "how many customers")
+- analyze: analysis of data (e.g., "what's the average delay", "find patterns")
+- visualize: explicitly wants a chart, graph, or visualization
+- schema: wants to know about the database structure
+- help: needs help or has a general question
+- query+viz: retrieve data that would benefit from a chart"""
+
+
+def get_intent_label_prompt(message: str) -> str:
+    """Generate the prompt for classifying user intent as a single label."""
+    return f"""Classify this user message for a data science agent.
+
+{INTENT_LABELS_TEXT}
+
+Respond with exactly one of: query|analyze|visualize|schema|help|query+viz
+
+User message: {message}"""
+
+
+def get_intent_batch_label_prompt(messages: list) -> str:
+    """Generate the prompt for labelling several user messages in one call."""
+    numbered_messages = "\n".join(f"{i}. {m}" for i, m in enumerate(messages, 1))
+    return f"""Classify each numbered user message for a data science agent.
+
+{INTENT_LABELS_TEXT}
+
+Respond with one line per message, in order, formatted as "<number>. <label>"
+where <label> is exactly one of: query|analyze|visualize|schema|help|query+viz
+
+User messages:
+{numbered_messages}"""
+
+
 # =============================================================================
 # SQL GENERATION PROMPTS
 # =============================================================================
 
 SQL_GENERATOR_SYSTEM = "You are a SQL expert that translates natural language to SQL queries."
 
-SQL_GUIDELINES = """Important guidelines:
-1. Only generate SELECT queries - no INSERT, UPDATE, DELETE, or other modifications
-2. Use appropriate JOINs when data spans multiple tables
-3. Use aliases for clarity when joining tables
-4. Add appropriate WHERE clauses to filter data
-5. Use GROUP BY and aggregate functions (COUNT, SUM, AVG, etc.) when appropriate
-6. Add ORDER BY for meaningful result ordering
-7. Use LIMIT to prevent returning too many rows (default: 100)
-8. Handle NULL values appropriately
-9. Use appropriate date/time functions for temporal queries"""
+# Kept terse: these are sent with every SQL generation call. Rules that matter
+# mainly after a failure (NULL handling, date functions) live in the fix prompt.
+SQL_GUIDELINES = (
+    "Guidelines: SELECT only (no INSERT/UPDATE/DELETE or other modifications); "
+    "JOIN related tables using aliases; filter with WHERE, aggregate with GROUP BY, "
+    "order with ORDER BY; LIMIT 100 unless asked otherwise."
+)
 
 
-def get_nl2sql_prompt(question: str, schema_text: str) -> str:
-    """Generate the prompt for NL2SQL translation."""
-    return f"""You are a SQL expert. Your task is to translate natural language questions into SQL queries.
+# The NL2SQL and fix prompts put the static blocks (instructions, guidelines,
+# schema) first and the per-request content last, so consecutive requests share
+# an identical prefix that providers can serve from their prompt cache. The
+# fixed text is assembled once here; only the schema and question are added per call.
 
-{schema_text}
+NL2SQL_PREAMBLE = f"""You are a SQL expert. Your task is to translate natural language questions into SQL queries.
 
 {SQL_GUIDELINES}
 
-User Question: {question}
+"""
+
+NL2SQL_INSTRUCTIONS = """
 
-Generate a SQL query to answer this question. Respond with:
+Generate a SQL query to answer the user question below. Respond with:
 1. The SQL query
 2. A brief explanation of what it does
-3. The tables used"""
+3. The tables used
+
+User Question: """
+
+NL2SQL_BATCH_INSTRUCTIONS = """
+
+Generate one SQL query for each numbered user question below. For each question, respond with:
+1. The SQL query
+2. A brief explanation of what it does
+3. The tables used
+
+"""
+
+
+def get_nl2sql_prompt(question: str, schema_text: str) -> str:
+    """Generate the prompt for NL2SQL translation."""
+    return "".join((NL2SQL_PREAMBLE, schema_text, NL2SQL_INSTRUCTIONS, question))
+
+
+def get_nl2sql_batch_prompt(questions: list, schema_text: str) -> str:
+    """Generate the prompt for translating several questions in one call."""
+    numbered_questions = "\n".join(f"{i}. {q}" for i, q in enumerate(questions, 1))
+    return "".join((
+        NL2SQL_PREAMBLE,
+        schema_text,
+        NL2SQL_BATCH_INSTRUCTIONS,
+        f"Return exactly {len(questions)} items, one per question, in the same order.\n\n",
+        "User Questions:\n",
+        numbered_questions
+    ))
 
 
 # =============================================================================
@@ -81,23 +144,31 @@ Generate a SQL query to answer this question. Respond with:
 
 SQL_FIXER_SYSTEM = "You are a SQL expert that fixes SQL queries."
 
+SQL_FIX_PREAMBLE = "A SQL query produced an error. Please fix it.\n\n"
 
-def get_sql_fix_prompt(original_query: str, error_message: str, schema_text: str) -> str:
-    """Generate the prompt for fixing a failed SQL query."""
-    return f"""The following SQL query produced an error. Please fix it.
+SQL_FIX_INSTRUCTIONS = """
 
-{schema_text}
+Please provide a corrected SQL query that addresses the error. Remember:
+1. Only SELECT queries are allowed
+2. Check table and column names against the schema
+3. Ensure proper syntax for the database type
+4. Handle NULL values explicitly (IS NULL, COALESCE)
+5. Use this database's own date/time functions for temporal logic
 
 Original Query:
-{original_query}
+"""
 
-Error Message:
-{error_message}
 
-Please provide a corrected SQL query that addresses the error. Remember:
-1. Only SELECT queries are allowed
-2. Check table and column names against the schema
-3. Ensure proper syntax for the database type"""
+def get_sql_fix_prompt(original_query: str, error_message: str, schema_text: str) -> str:
+    """Generate the prompt for fixing a failed SQL query."""
+    return "".join((
+        SQL_FIX_PREAMBLE,
+        schema_text,
+        SQL_FIX_INSTRUCTIONS,
+        original_query,
+        "\n\nError Message:\n",
+        error_message
+    ))
 
 
 # =============================================================================
@@ -107,57 +178,60 @@ Please provide a corrected SQL query that addresses the error. Remember:
 ANALYSIS_CODE_GENERATOR_SYSTEM = "You are a data analyst writing Python code for analysis and visualization."
 
 
-def get_analysis_prompt(question: str, data_description: str, data_context: str = "") -> str:
-    """Generate the prompt for data analysis code generation."""
-    return f"""You are a data analyst writing Python code for analysis and visualization.
-
-{data_description}
-{data_context}
-
-Task: {question}
-
-Write Python code to answer this question. Guidelines:
-1. Use pandas for data manipulation
-2. Use matplotlib or seaborn for visualizations
-3. The data is already loaded in a variable called 'data' (pandas DataFrame)
-4. If creating a visualization, save it using plt.savefig(output_path) where output_path is provided
-5. Print any numerical results or insights
-6. Keep the code concise and focused
-7. Add brief comments for clarity
-8. Handle potential errors gracefully
-9. For visualizations:
-   - Use clear titles and labels
-   - Choose appropriate chart types
-   - Use a clean style (seaborn or matplotlib styles)
-   - Set figure size appropriately
-
-Important: The variable 'data' contains the query results as a pandas DataFrame.
-The variable 'output_path' contains the path where any visualization should be saved.
+ANALYSIS_INSTRUCTIONS = """
+
+Write Python code to answer this. 'data' holds the query results (pandas DataFrame); 'output_path' is where to save any chart.
+- pandas for data; matplotlib/seaborn for charts, saved with plt.savefig(output_path)
+- Print numerical results and insights
+- Concise code, brief comments, handle errors gracefully
+- Charts: clear title and labels, a suitable chart type and figure size
 
 Generate only the Python code, no markdown formatting."""
 
 
-ANALYSIS_FIXER_SYSTEM = "You are a data analyst fixing Python code."
+# Appended to the data context for large results (see agents/fast_kernels.py)
+FAST_HELPERS_NOTE = """
+Compiled helpers are available for large data; prefer them over Python loops:
+- fast_groupby_mean(keys, values) -> pandas Series of means per key
+- fast_rolling_std(values, window) -> numpy array of rolling standard deviations
+"""
 
 
-def get_analysis_fix_prompt(original_code: str, error_message: str, data_description: str) -> str:
-    """Generate the prompt for fixing failed analysis code."""
-    return f"""The following Python code produced an error. Please fix it.
+def get_analysis_prompt(question: str, data_description: str, data_context: str = "") -> str:
+    """Generate the prompt for data analysis code generation."""
+    return "".join((
+        "You are a data analyst writing Python code for analysis and visualization.\n\n",
+        data_description,
+        "\n",
+        data_context,
+        "\n\nTask: ",
+        question,
+        ANALYSIS_INSTRUCTIONS
+    ))
 
-{data_description}
 
-Original Code:
-```python
-{original_code}
-```
+ANALYSIS_FIXER_SYSTEM = "You are a data analyst fixing Python code."
 
-Error:
-{error_message}
+
+ANALYSIS_FIX_INSTRUCTIONS = """
 
 Please provide corrected Python code that addresses the error. Maintain the same
 analysis goal but fix the issues."""
 
 
+def get_analysis_fix_prompt(original_code: str, error_message: str, data_description: str) -> str:
+    """Generate the prompt for fixing failed analysis code."""
+    return "".join((
+        "The following Python code produced an error. Please fix it.\n\n",
+        data_description,
+        "\n\nOriginal Code:\n```python\n",
+        original_code,
+        "\n```\n\nError:\n",
+        error_message,
+        ANALYSIS_FIX_INSTRUCTIONS
+    ))
+
+
 # =============================================================================
 # RESULT SUMMARIZATION
 # =============================================================================
@@ -199,6 +273,25 @@ Output:
 Provide a clear summary of the insights and findings."""
 
 
+CHART_CAPTION_SYSTEM = "You write short, descriptive captions for data charts."
+
+
+def get_chart_caption_prompt(question: str, explanation: str, code: str) -> str:
+    """Generate the prompt for captioning the charts produced by an analysis."""
+    return f"""Write a one-sentence caption for the chart produced by this analysis.
+
+Question: {question}
+
+Analysis explanation: {explanation}
+
+Code that produced the chart:
+```python
+{code}
+```
+
+Describe what the chart shows (chart type, measure, and grouping). Respond with the caption only."""
+
+
 # =============================================================================
 # ALTERNATIVE PROMPTS (uncomment and modify for different use cases)
 # =============================================================================
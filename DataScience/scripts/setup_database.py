@@ -4,8 +4,9 @@ DigitalOcean Database Setup Script
 
 This script:
 1. Creates a PostgreSQL or MySQL database cluster on DigitalOcean
-2. Waits for the cluster to be ready
-3. Creates a readonly user for the agent
+2. Creates the database and a readonly user for the agent (queued while
+   the cluster provisions, retried once it is ready if needed)
+3. Waits for the cluster to be ready
 4. Loads the schema and sample data
 5. Outputs connection details for the .env file
 
@@ -18,18 +19,41 @@ Requirements:
     - pip install requests psycopg2-binary mysql-connector-python
 """
 
+import io
 import os
+import re
+import mmap
 import sys
 import time
 import argparse
 import secrets
 import string
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # DigitalOcean API base URL
 DO_API_BASE = "https://api.digitalocean.com/v2"
 
+# DigitalOcean engine name for each supported --db-type
+ENGINE_MAP = {
+    "postgres": "pg",
+    "mysql": "mysql"
+}
+
+# Characters used in generated passwords (alphanumeric, safe in .env files and URLs)
+_PASSWORD_ALPHABET = string.ascii_letters + string.digits
+
+# Shared API session (created on first request)
+_session = None
+
+# Successful GET responses reused for this many seconds: endpoint -> (fetched_at, response)
+GET_CACHE_TTL = 10
+_get_cache = {}
+
 
 def get_api_token():
     """Get DigitalOcean API token from environment."""
@@ -42,27 +66,82 @@ def get_api_token():
 
 def generate_password(length=24):
     """Generate a secure random password."""
-    alphabet = string.ascii_letters + string.digits
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+    return ''.join(secrets.choice(_PASSWORD_ALPHABET) for _ in range(length))
+
+
+class _ApiRetry(Retry):
+    """
+    Retry policy that never resends a POST the API may have acted on.
+
+    POST is left out of allowed_methods, so it is not retried after server
+    errors or read failures; only a 429, which means the request was
+    rejected before being processed, is retried.
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method == "POST" and status_code == 429:
+            return bool(self.total)
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def get_session(token):
+    """
+    Get the shared session for DigitalOcean API requests.
+
+    Requests reuse pooled keep-alive connections instead of a new TLS
+    handshake each, and rate limits (429) and transient server errors are
+    retried with backoff, honoring Retry-After. POST requests are only
+    retried on 429 so resources are never created twice.
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers.update({
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json"
+        })
+        retry = _ApiRetry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "DELETE"],
+            raise_on_status=False
+        )
+        _session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    return _session
+
+
+def invalidate(endpoint_prefix):
+    """Drop cached GET responses for endpoints starting with a prefix."""
+    for endpoint in list(_get_cache):
+        if endpoint.startswith(endpoint_prefix):
+            _get_cache.pop(endpoint, None)
+
+
+def api_request(method, endpoint, token, data=None, use_cache=True):
+    """
+    Make a request to the DigitalOcean API.
+
+    Successful GETs are cached for GET_CACHE_TTL seconds, so repeated
+    lookups (e.g. listing clusters before and after a create conflict)
+    cost one round trip. Any POST or DELETE clears cached responses for
+    the endpoint it changed. Pass use_cache=False to always fetch.
+    """
+    if method not in ("GET", "POST", "DELETE"):
+        raise ValueError(f"Unsupported method: {method}")
 
+    if method == "GET" and use_cache:
+        cached = _get_cache.get(endpoint)
+        if cached and time.time() - cached[0] < GET_CACHE_TTL:
+            return cached[1]
 
-def api_request(method, endpoint, token, data=None):
-    """Make a request to the DigitalOcean API."""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    url = f"{DO_API_BASE}/{endpoint}"
+    response = get_session(token).request(method, f"{DO_API_BASE}/{endpoint}", json=data)
 
     if method == "GET":
-        response = requests.get(url, headers=headers)
-    elif method == "POST":
-        response = requests.post(url, headers=headers, json=data)
-    elif method == "DELETE":
-        response = requests.delete(url, headers=headers)
+        if response.status_code == 200:
+            _get_cache[endpoint] = (time.time(), response)
     else:
-        raise ValueError(f"Unsupported method: {method}")
-
+        invalidate(endpoint)
     return response
 
 
@@ -77,13 +156,7 @@ def find_existing_cluster(token, cluster_name, db_type):
         return None
 
     clusters = response.json().get("databases", [])
-
-    # Map db_type to DigitalOcean engine
-    engine_map = {
-        "postgres": "pg",
-        "mysql": "mysql"
-    }
-    engine = engine_map.get(db_type)
+    engine = ENGINE_MAP[db_type]
 
     for cluster in clusters:
         if cluster.get("name") == cluster_name and cluster.get("engine") == engine:
@@ -104,20 +177,10 @@ def create_database_cluster(token, db_type, region, cluster_name):
 
     print(f"Creating {db_type} database cluster '{cluster_name}' in {region}...")
 
-    # Map db_type to DigitalOcean engine
-    engine_map = {
-        "postgres": "pg",
-        "mysql": "mysql"
-    }
-    engine = engine_map.get(db_type)
-    if not engine:
-        print(f"Error: Unsupported database type: {db_type}")
-        sys.exit(1)
-
     # Database cluster configuration
     data = {
         "name": cluster_name,
-        "engine": engine,
+        "engine": ENGINE_MAP[db_type],
         "version": "16" if db_type == "postgres" else "8",
         "region": region,
         "size": "db-s-1vcpu-1gb",  # Smallest size for development
@@ -145,35 +208,67 @@ def create_database_cluster(token, db_type, region, cluster_name):
         sys.exit(1)
 
 
-def wait_for_cluster_ready(token, cluster_id, timeout=600):
-    """Wait for the database cluster to be online."""
-    # First check if already online
-    response = api_request("GET", f"databases/{cluster_id}", token)
-    if response.status_code == 200:
-        cluster = response.json()["database"]
-        status = cluster.get("status")
-        if status == "online":
-            print("Database cluster is already online!")
-            return cluster
+def poll_with_backoff(fn, is_done, timeout, initial=2.0, cap=30.0, factor=1.7):
+    """
+    Call fn until is_done(result) is true, sleeping with exponential backoff.
 
-    print("Waiting for database cluster to be ready...")
-    start_time = time.time()
+    Args:
+        fn: Function to poll
+        is_done: Predicate on fn's result that ends polling
+        timeout: Maximum seconds to keep polling
+        initial: First delay in seconds
+        cap: Maximum delay in seconds
+        factor: Multiplier applied to the delay after each poll
 
-    while time.time() - start_time < timeout:
-        response = api_request("GET", f"databases/{cluster_id}", token)
+    Returns:
+        The first result for which is_done is true, or None on timeout
+    """
+    deadline = time.time() + timeout
+    delay = initial
 
-        if response.status_code == 200:
-            cluster = response.json()["database"]
-            status = cluster.get("status")
-            print(f"  Status: {status}")
+    while True:
+        result = fn()
+        if is_done(result):
+            return result
 
-            if status == "online":
-                print("Database cluster is ready!")
-                return cluster
-        else:
-            print(f"Error checking cluster status: {response.status_code}")
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return None
+        time.sleep(min(delay, remaining))
+        delay = min(delay * factor, cap)
+
+
+# Cluster statuses that will never become "online"
+FAILED_CLUSTER_STATUSES = {"failed", "error"}
+
+
+def wait_for_cluster_ready(token, cluster_id, timeout=600):
+    """Wait for the database cluster to be online."""
+    print("Waiting for database cluster to be ready...")
 
-        time.sleep(30)  # Check every 30 seconds
+    def get_status():
+        response = api_request("GET", f"databases/{cluster_id}", token, use_cache=False)
+        if response.status_code != 200:
+            print(f"Error checking cluster status: {response.status_code}")
+            return None, None
+        cluster = response.json()["database"]
+        status = cluster.get("status")
+        print(f"  Status: {status}")
+        return cluster, status
+
+    # Polls quickly at first, then backs off to every 30 seconds
+    cluster, status = poll_with_backoff(
+        get_status,
+        lambda result: result[1] == "online" or result[1] in FAILED_CLUSTER_STATUSES,
+        timeout
+    ) or (None, None)
+
+    if status == "online":
+        print("Database cluster is ready!")
+        return cluster
+    if status in FAILED_CLUSTER_STATUSES:
+        print(f"Database cluster provisioning failed with status: {status}")
+        sys.exit(1)
 
     print("Timeout waiting for database cluster to be ready")
     sys.exit(1)
@@ -181,21 +276,21 @@ def wait_for_cluster_ready(token, cluster_id, timeout=600):
 
 def find_existing_database(token, cluster_id, db_name):
     """Check if a database already exists in the cluster."""
-    response = api_request("GET", f"databases/{cluster_id}/dbs", token)
-
-    if response.status_code != 200:
-        return None
+    response = api_request("GET", f"databases/{cluster_id}/dbs/{db_name}", token)
 
-    databases = response.json().get("dbs", [])
-    for db in databases:
-        if db.get("name") == db_name:
-            return db
+    if response.status_code == 200:
+        return response.json().get("db")
 
     return None
 
 
-def create_database(token, cluster_id, db_name):
-    """Create a database in the cluster, or return existing one."""
+def create_database(token, cluster_id, db_name, speculative=False):
+    """
+    Create a database in the cluster, or return existing one.
+
+    With speculative, the cluster may still be provisioning: errors return
+    None instead of exiting so the call can be retried once it is online.
+    """
     print(f"Creating database '{db_name}'...")
 
     # Check if database already exists
@@ -214,6 +309,9 @@ def create_database(token, cluster_id, db_name):
         # Race condition - database was created between check and create
         print(f"Database '{db_name}' already exists")
         return {"name": db_name}
+    elif speculative:
+        print(f"Cluster not accepting database creation yet ({response.status_code}), will retry")
+        return None
     else:
         print(f"Error creating database: {response.status_code}")
         print(response.json())
@@ -230,8 +328,13 @@ def find_existing_user(token, cluster_id, username):
     return None
 
 
-def create_readonly_user(token, cluster_id, username, db_type):
-    """Create a readonly user for the agent, or return existing one."""
+def create_readonly_user(token, cluster_id, username, db_type, speculative=False):
+    """
+    Create a readonly user for the agent, or return existing one.
+
+    With speculative, the cluster may still be provisioning: errors return
+    None instead of exiting so the call can be retried once it is online.
+    """
     print(f"Creating readonly user '{username}'...")
 
     # Check if user already exists
@@ -263,14 +366,252 @@ def create_readonly_user(token, cluster_id, username, db_type):
         else:
             print(f"Error fetching user: {response.status_code}")
             sys.exit(1)
+    elif speculative:
+        print(f"Cluster not accepting user creation yet ({response.status_code}), will retry")
+        return None
     else:
         print(f"Error creating user: {response.status_code}")
         print(response.json())
         sys.exit(1)
 
 
-def load_schema_and_data(connection_params, db_type):
-    """Load the schema and sample data into the database."""
+# Lexical units of a SQL script: quoted strings/identifiers, dollar-quoted
+# bodies, comments, statement separators, and runs of everything else
+_SQL_TOKEN_PATTERN = re.compile(
+    rb"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\$(\w*)\$.*?\$\1\$|--[^\n]*|/\*.*?\*/|;|[^'\"$;/-]+|.",
+    re.DOTALL
+)
+
+
+def iter_statements(sql):
+    """
+    Yield the statements of a SQL script one at a time.
+
+    Unlike sql.split(';'), semicolons inside string literals, quoted
+    identifiers, dollar-quoted bodies, and comments don't end a statement.
+    Statements are stripped, and comment-only fragments are skipped.
+
+    Args:
+        sql: UTF-8 SQL script as bytes or a memory-mapped file
+
+    Yields:
+        Each statement without its trailing semicolon, decoded to str
+    """
+    start = 0
+    has_code = False
+    for token in _SQL_TOKEN_PATTERN.finditer(sql):
+        text = token.group()
+        if text == b";":
+            if has_code:
+                yield sql[start:token.start()].strip().decode("utf-8")
+            start = token.end()
+            has_code = False
+        elif not has_code and not text.startswith((b"--", b"/*")) and not text.isspace():
+            has_code = True
+    if has_code:
+        yield sql[start:].strip().decode("utf-8")
+
+
+def map_sql_file(path):
+    """
+    Memory-map a SQL file for iter_statements.
+
+    Statements are decoded one at a time as they're executed instead of
+    reading and decoding the whole file up front.
+
+    Args:
+        path: Path to the SQL file
+
+    Returns:
+        Read-only mmap of the file, or b"" if it is missing or empty
+    """
+    if not path.exists() or path.stat().st_size == 0:
+        return b""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def create_database_and_user(token, cluster_id, db_name, username, db_type, speculative=False):
+    """
+    Create the database and readonly user concurrently (independent API calls).
+
+    Returns:
+        (database, user); with speculative, either is None if the cluster
+        didn't accept the request yet
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        db_future = executor.submit(create_database, token, cluster_id, db_name, speculative)
+        user_future = executor.submit(
+            create_readonly_user, token, cluster_id, username, db_type, speculative
+        )
+        return db_future.result(), user_future.result()
+
+
+# INSERT INTO table (columns) VALUES ... and the tokens of its VALUES list
+_INSERT_PATTERN = re.compile(
+    r"^(?:\s|--[^\n]*)*INSERT\s+INTO\s+(\w+)\s*\(([^)]*)\)\s*VALUES\s*(.*)$",
+    re.IGNORECASE | re.DOTALL
+)
+_VALUE_TOKEN_PATTERN = re.compile(
+    r"(?:\s|--[^\n]*)*(?:'(?P<string>(?:[^']|'')*)'|(?P<null>NULL)\b|(?P<bool>TRUE|FALSE)\b"
+    r"|(?P<number>-?\d+(?:\.\d+)?)(?![\w.])|(?P<punct>[(),]))(?:\s|--[^\n]*)*",
+    re.IGNORECASE
+)
+
+
+def parse_insert(statement):
+    """
+    Parse a multi-row INSERT of literal values into its table, columns, and rows.
+
+    Args:
+        statement: SQL statement
+
+    Returns:
+        (table, columns, rows) with rows as tuples of Python values, or None
+        if the statement is not an INSERT of plain literals (strings,
+        numbers, NULL, TRUE/FALSE)
+    """
+    match = _INSERT_PATTERN.match(statement)
+    if not match:
+        return None
+    table, columns, values = match.groups()
+
+    rows = []
+    row = None
+    expect_value = False
+    pos = 0
+    values = values.rstrip()
+    while pos < len(values):
+        token = _VALUE_TOKEN_PATTERN.match(values, pos)
+        if not token:
+            return None  # Expressions or function calls: execute as written
+        pos = token.end()
+        kind = token.lastgroup
+
+        if kind == "punct":
+            punct = token.group("punct")
+            if punct == "(" and row is None:
+                row, expect_value = [], True
+            elif punct == "," and row is not None and not expect_value:
+                expect_value = True
+            elif punct == ")" and row is not None and not expect_value:
+                rows.append(tuple(row))
+                row = None
+            elif punct == "," and row is None and rows:
+                continue
+            else:
+                return None
+            continue
+
+        if row is None or not expect_value:
+            return None
+        if kind == "string":
+            value = token.group("string").replace("''", "'")
+        elif kind == "null":
+            value = None
+        elif kind == "bool":
+            value = token.group("bool").upper() == "TRUE"
+        else:
+            number = token.group("number")
+            value = Decimal(number) if "." in number else int(number)
+        row.append(value)
+        expect_value = False
+
+    if row is not None or not rows:
+        return None
+    return table, " ".join(columns.split()), rows
+
+
+def _csv_field(value):
+    """Format a parsed value for COPY ... (FORMAT csv), keeping NULL distinct from ''."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    return str(value)
+
+
+def copy_rows(cursor, table, columns, rows):
+    """
+    Load rows into a PostgreSQL table with COPY, skipping rows that already exist.
+
+    COPY can't skip conflicting rows itself, so rows are streamed into a
+    temporary staging table and moved with INSERT ... ON CONFLICT DO NOTHING.
+
+    Args:
+        cursor: psycopg2 cursor
+        table: Target table name
+        columns: Comma-separated column list
+        rows: Tuples of Python values, as returned by parse_insert
+
+    Returns:
+        Number of rows inserted
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(_csv_field(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    staging = f"_load_{table}"
+    cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+    cursor.execute(f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS)")
+    try:
+        cursor.copy_expert(f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        cursor.execute(
+            f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging} ON CONFLICT DO NOTHING"
+        )
+        return cursor.rowcount
+    finally:
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+
+
+# Leading "INSERT INTO" of a statement (after any comments)
+_INSERT_VERB_PATTERN = re.compile(r"^((?:\s|--[^\n]*)*)INSERT\s+INTO\b", re.IGNORECASE)
+
+
+def _code_end(statement):
+    """Return the offset just past a statement's last token that isn't a comment."""
+    data = statement.encode("utf-8")
+    end = 0
+    for token in _SQL_TOKEN_PATTERN.finditer(data):
+        text = token.group()
+        if not text.startswith((b"--", b"/*")) and not text.isspace():
+            end = token.end()
+    return len(data[:end].decode("utf-8"))
+
+
+def make_insert_idempotent(statement, db_type):
+    """
+    Rewrite an INSERT so the server skips rows that already exist.
+
+    Args:
+        statement: SQL statement
+        db_type: "postgres" (adds ON CONFLICT DO NOTHING) or "mysql" (INSERT IGNORE)
+
+    Returns:
+        The rewritten INSERT, or the statement unchanged if it isn't a
+        plain INSERT
+    """
+    if not _INSERT_VERB_PATTERN.match(statement):
+        return statement
+    if db_type == "mysql":
+        return _INSERT_VERB_PATTERN.sub(r"\1INSERT IGNORE INTO", statement, count=1)
+    if re.search(r"\b(?:ON\s+CONFLICT|RETURNING)\b", statement, re.IGNORECASE):
+        return statement
+    # Insert the clause after the last code token, so it never ends up
+    # inside a trailing -- comment
+    code = statement[:_code_end(statement)].rstrip()
+    return f"{code} ON CONFLICT DO NOTHING{statement[len(code):]}"
+
+
+def load_schema_and_data(connection_params, db_type, bulk_load=False):
+    """
+    Load the schema and sample data into the database.
+
+    With bulk_load (PostgreSQL only), sample data rows are streamed with
+    COPY instead of batched INSERTs.
+    """
     print("Loading schema and sample data...")
 
     # Get the data directory
@@ -283,10 +624,11 @@ def load_schema_and_data(connection_params, db_type):
         print(f"Error: Schema file not found: {schema_file}")
         sys.exit(1)
 
-    schema_sql = schema_file.read_text()
-    data_sql = data_file.read_text() if data_file.exists() else ""
+    schema_sql = map_sql_file(schema_file)
+    data_sql = map_sql_file(data_file)
 
     schema_errors = 0
+    data_skipped = 0
     data_errors = 0
 
     if db_type == "postgres":
@@ -297,35 +639,49 @@ def load_schema_and_data(connection_params, db_type):
 
         # Execute schema (statement by statement for better error handling)
         print("  Executing schema...")
-        for statement in schema_sql.split(';'):
-            statement = statement.strip()
-            if statement:
-                try:
-                    cursor.execute(statement)
-                except psycopg2.errors.DuplicateTable:
-                    print(f"  Table already exists, skipping...")
-                    schema_errors += 1
-                except psycopg2.errors.DuplicateObject:
-                    print(f"  Object already exists, skipping...")
-                    schema_errors += 1
-                except Exception as e:
-                    print(f"  Schema warning: {e}")
-                    schema_errors += 1
+        for statement in iter_statements(schema_sql):
+            try:
+                cursor.execute(statement)
+            except psycopg2.errors.DuplicateTable:
+                print(f"  Table already exists, skipping...")
+                schema_errors += 1
+            except psycopg2.errors.DuplicateObject:
+                print(f"  Object already exists, skipping...")
+                schema_errors += 1
+            except Exception as e:
+                print(f"  Schema warning: {e}")
+                schema_errors += 1
 
-        # Execute sample data
+        # Execute sample data: rows of each INSERT are sent in batches and
+        # rows that already exist are skipped by the server
         if data_sql:
+            from psycopg2.extras import execute_values
             print("  Loading sample data...")
-            for statement in data_sql.split(';'):
-                statement = statement.strip()
-                if statement:
-                    try:
-                        cursor.execute(statement)
-                    except psycopg2.errors.UniqueViolation:
-                        # Data already exists, skip
-                        data_errors += 1
-                    except Exception as e:
-                        print(f"  Data warning: {e}")
-                        data_errors += 1
+            for statement in iter_statements(data_sql):
+                parsed = parse_insert(statement)
+                try:
+                    if parsed:
+                        table, columns, rows = parsed
+                        if bulk_load:
+                            inserted = copy_rows(cursor, table, columns, rows)
+                        else:
+                            # RETURNING counts inserted rows across all pages
+                            inserted = len(execute_values(
+                                cursor,
+                                f"INSERT INTO {table} ({columns}) VALUES %s ON CONFLICT DO NOTHING RETURNING 1",
+                                rows,
+                                page_size=500,
+                                fetch=True
+                            ))
+                        data_skipped += len(rows) - inserted
+                    else:
+                        cursor.execute(make_insert_idempotent(statement, db_type))
+                except psycopg2.errors.UniqueViolation:
+                    # Data already exists, skip
+                    data_skipped += 1
+                except Exception as e:
+                    print(f"  Data warning: {e}")
+                    data_errors += 1
 
         cursor.close()
         conn.close()
@@ -338,56 +694,69 @@ def load_schema_and_data(connection_params, db_type):
 
         # Execute schema (split by semicolons for MySQL)
         print("  Executing schema...")
-        for statement in schema_sql.split(';'):
-            statement = statement.strip()
-            if statement:
-                # Adapt PostgreSQL syntax for MySQL
-                statement = statement.replace('SERIAL', 'INT AUTO_INCREMENT')
-                # Keep IF NOT EXISTS for CREATE TABLE
-                # Convert CREATE INDEX IF NOT EXISTS to MySQL syntax
-                if 'CREATE INDEX IF NOT EXISTS' in statement:
-                    # MySQL 8.0+ supports IF NOT EXISTS for indexes
-                    pass
-                try:
-                    cursor.execute(statement)
-                except mysql.connector.Error as e:
-                    if e.errno == errorcode.ER_TABLE_EXISTS_ERROR:
-                        print(f"  Table already exists, skipping...")
-                        schema_errors += 1
-                    elif e.errno == errorcode.ER_DUP_KEYNAME:
-                        print(f"  Index already exists, skipping...")
-                        schema_errors += 1
-                    else:
-                        print(f"  Schema warning: {e}")
-                        schema_errors += 1
+        for statement in iter_statements(schema_sql):
+            # Adapt PostgreSQL syntax for MySQL
+            statement = statement.replace('SERIAL', 'INT AUTO_INCREMENT')
+            # Keep IF NOT EXISTS for CREATE TABLE
+            # Convert CREATE INDEX IF NOT EXISTS to MySQL syntax
+            if 'CREATE INDEX IF NOT EXISTS' in statement:
+                # MySQL 8.0+ supports IF NOT EXISTS for indexes
+                pass
+            try:
+                cursor.execute(statement)
+            except mysql.connector.Error as e:
+                if e.errno == errorcode.ER_TABLE_EXISTS_ERROR:
+                    print(f"  Table already exists, skipping...")
+                    schema_errors += 1
+                elif e.errno == errorcode.ER_DUP_KEYNAME:
+                    print(f"  Index already exists, skipping...")
+                    schema_errors += 1
+                else:
+                    print(f"  Schema warning: {e}")
+                    schema_errors += 1
 
         conn.commit()
 
-        # Execute sample data
+        # Execute sample data: rows of each INSERT are sent in batches and
+        # rows that already exist are skipped by the server
         if data_sql:
             print("  Loading sample data...")
-            for statement in data_sql.split(';'):
-                statement = statement.strip()
-                if statement:
-                    try:
-                        cursor.execute(statement)
-                    except mysql.connector.Error as e:
-                        if e.errno == errorcode.ER_DUP_ENTRY:
-                            # Data already exists, skip
-                            data_errors += 1
-                        else:
-                            print(f"  Data warning: {e}")
-                            data_errors += 1
+            for statement in iter_statements(data_sql):
+                parsed = parse_insert(statement)
+                try:
+                    if parsed:
+                        table, columns, rows = parsed
+                        placeholders = ", ".join(["%s"] * len(rows[0]))
+                        cursor.executemany(
+                            f"INSERT IGNORE INTO {table} ({columns}) VALUES ({placeholders})",
+                            rows
+                        )
+                        data_skipped += len(rows) - max(cursor.rowcount, 0)
+                    else:
+                        cursor.execute(make_insert_idempotent(statement, db_type))
+                except mysql.connector.Error as e:
+                    if e.errno == errorcode.ER_DUP_ENTRY:
+                        # Data already exists, skip
+                        data_skipped += 1
+                    else:
+                        print(f"  Data warning: {e}")
+                        data_errors += 1
 
             conn.commit()
 
         cursor.close()
         conn.close()
 
+    for mapped in (schema_sql, data_sql):
+        if isinstance(mapped, mmap.mmap):
+            mapped.close()
+
     if schema_errors > 0:
         print(f"  Schema: {schema_errors} objects already existed (OK)")
+    if data_skipped > 0:
+        print(f"  Data: {data_skipped} records already existed (OK)")
     if data_errors > 0:
-        print(f"  Data: {data_errors} records already existed (OK)")
+        print(f"  Data: {data_errors} statements failed (see warnings above)")
     print("Schema and data loaded successfully!")
 
 
@@ -397,23 +766,25 @@ def grant_readonly_permissions(connection_params, db_type, db_name, readonly_use
 
     if db_type == "postgres":
         import psycopg2
+        from psycopg2 import sql
         conn = psycopg2.connect(**connection_params)
-        conn.autocommit = True
         cursor = conn.cursor()
 
-        grants = [
-            f"GRANT CONNECT ON DATABASE {db_name} TO {readonly_user};",
-            f"GRANT USAGE ON SCHEMA public TO {readonly_user};",
-            f"GRANT SELECT ON ALL TABLES IN SCHEMA public TO {readonly_user};",
-            f"ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT SELECT ON TABLES TO {readonly_user};"
-        ]
+        # All grants in one round trip and one transaction
+        grants = sql.SQL(
+            "GRANT CONNECT ON DATABASE {db} TO {user}; "
+            "GRANT USAGE ON SCHEMA public TO {user}; "
+            "GRANT SELECT ON ALL TABLES IN SCHEMA public TO {user}; "
+            "ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT SELECT ON TABLES TO {user};"
+        ).format(db=sql.Identifier(db_name), user=sql.Identifier(readonly_user))
 
-        for grant in grants:
-            try:
-                cursor.execute(grant)
-                print(f"  Executed: {grant[:50]}...")
-            except Exception as e:
-                print(f"  Warning: {e}")
+        try:
+            cursor.execute(grants)
+            conn.commit()
+            print(f"  Granted CONNECT, USAGE, and SELECT (including future tables) to {readonly_user}")
+        except Exception as e:
+            conn.rollback()
+            print(f"  Warning: {e}")
 
         cursor.close()
         conn.close()
@@ -423,10 +794,10 @@ def grant_readonly_permissions(connection_params, db_type, db_name, readonly_use
         conn = mysql.connector.connect(**connection_params)
         cursor = conn.cursor()
 
-        grant = f"GRANT SELECT ON {db_name}.* TO '{readonly_user}'@'%';"
+        # GRANT reloads the grant tables itself; FLUSH PRIVILEGES isn't needed
+        grant = f"GRANT SELECT ON `{db_name}`.* TO '{readonly_user}'@'%';"
         try:
             cursor.execute(grant)
-            cursor.execute("FLUSH PRIVILEGES;")
             print(f"  Granted SELECT on {db_name} to {readonly_user}")
         except Exception as e:
             print(f"  Warning: {e}")
@@ -442,31 +813,31 @@ def write_env_file(env_vars, output_path):
     """Write environment variables to a file."""
     print(f"Writing connection details to {output_path}...")
 
-    lines = [
-        "# Database Configuration (generated by setup script)",
-        f"DB_TYPE={env_vars['db_type']}",
-        f"DB_HOST={env_vars['host']}",
-        f"DB_PORT={env_vars['port']}",
-        f"DB_NAME={env_vars['database']}",
-        f"DB_USER={env_vars['readonly_user']}",
-        f"DB_PASSWORD={env_vars['readonly_password']}",
-        f"DB_SSL_MODE=require",
-        "",
-        "# Admin credentials (for reference only - do not use in agent)",
-        f"# DB_ADMIN_USER={env_vars['admin_user']}",
-        f"# DB_ADMIN_PASSWORD={env_vars['admin_password']}",
-        ""
-    ]
-
     with open(output_path, 'w') as f:
-        f.write('\n'.join(lines))
+        f.write(
+            "# Database Configuration (generated by setup script)\n"
+            f"DB_TYPE={env_vars['db_type']}\n"
+            f"DB_HOST={env_vars['host']}\n"
+            f"DB_PORT={env_vars['port']}\n"
+            f"DB_NAME={env_vars['database']}\n"
+            f"DB_USER={env_vars['readonly_user']}\n"
+            f"DB_PASSWORD={env_vars['readonly_password']}\n"
+            "DB_SSL_MODE=require\n"
+            "\n"
+            "# Admin credentials (for reference only - do not use in agent)\n"
+            f"# DB_ADMIN_USER={env_vars['admin_user']}\n"
+            f"# DB_ADMIN_PASSWORD={env_vars['admin_password']}\n"
+        )
+
+    # The file contains passwords: readable by the owner only
+    os.chmod(output_path, 0o600)
 
     print(f"Connection details saved to {output_path}")
 
 
 def main():
     parser = argparse.ArgumentParser(description="Setup DigitalOcean database for Data Science Agent")
-    parser.add_argument("--db-type", choices=["postgres", "mysql"], default="postgres",
+    parser.add_argument("--db-type", choices=list(ENGINE_MAP), default="postgres",
                         help="Database type (default: postgres)")
     parser.add_argument("--region", default="nyc1",
                         help="DigitalOcean region (default: nyc1)")
@@ -480,10 +851,13 @@ def main():
                         help="Skip cluster creation (use existing cluster)")
     parser.add_argument("--cluster-id",
                         help="Existing cluster ID (required with --skip-create)")
+    parser.add_argument("--bulk-load", action="store_true",
+                        help="Load sample data with COPY (PostgreSQL only)")
 
     args = parser.parse_args()
 
     token = get_api_token()
+    database_info = readonly_user_info = None
 
     if args.skip_create:
         if not args.cluster_id:
@@ -501,6 +875,13 @@ def main():
         cluster = create_database_cluster(token, args.db_type, args.region, args.cluster_name)
         cluster_id = cluster["id"]
 
+        # The API queues database and user creation on a provisioning cluster,
+        # so issue them now instead of after it comes online
+        if cluster.get("status") != "online":
+            database_info, readonly_user_info = create_database_and_user(
+                token, cluster_id, args.db_name, args.readonly_user, args.db_type, speculative=True
+            )
+
         # Wait for cluster to be ready
         cluster = wait_for_cluster_ready(token, cluster_id)
 
@@ -521,11 +902,12 @@ def main():
     print(f"  Port: {port}")
     print(f"  Admin User: {admin_user}")
 
-    # Create the database
-    create_database(token, cluster_id, args.db_name)
-
-    # Create readonly user
-    readonly_user_info = create_readonly_user(token, cluster_id, args.readonly_user, args.db_type)
+    # Create the database and readonly user, unless already done while provisioning
+    # (both calls are idempotent, so retrying the one that succeeded is harmless)
+    if database_info is None or readonly_user_info is None:
+        database_info, readonly_user_info = create_database_and_user(
+            token, cluster_id, args.db_name, args.readonly_user, args.db_type
+        )
     readonly_password = readonly_user_info.get("password")
 
     # Connection params for admin
@@ -549,7 +931,7 @@ def main():
         }
 
     # Load schema and data
-    load_schema_and_data(admin_conn_params, args.db_type)
+    load_schema_and_data(admin_conn_params, args.db_type, bulk_load=args.bulk_load)
 
     # Grant readonly permissions
     grant_readonly_permissions(admin_conn_params, args.db_type, args.db_name, args.readonly_user)
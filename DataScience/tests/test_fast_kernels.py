@@ -0,0 +1,35 @@
+"""Compare the numba kernels in agents/fast_kernels.py with their pandas fallbacks."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("numba")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents import fast_kernels  # noqa: E402
+
+
+@pytest.fixture
+def values():
+    """Large, closely spaced values with NaNs, including adjacent ones."""
+    rng = np.random.default_rng(0)
+    data = 1e9 + rng.random(2000)
+    data[[0, 50, 120, 121, 700, 1999]] = np.nan
+    return data
+
+
+@pytest.mark.parametrize("window", [2, 5, 30])
+def test_rolling_std_matches_pandas_fallback(monkeypatch, values, window):
+    compiled = fast_kernels.fast_rolling_std(values, window)
+
+    monkeypatch.setattr(fast_kernels, "numba", None)
+    fallback = fast_kernels.fast_rolling_std(values, window)
+
+    np.testing.assert_array_equal(np.isnan(compiled), np.isnan(fallback))
+    np.testing.assert_allclose(compiled, fallback, rtol=0, atol=1e-5, equal_nan=True)
+
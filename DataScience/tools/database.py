@@ -6,18 +6,92 @@ connection pooling and error handling.
 """
 
 import os
+import re
+import time
+import hashlib
 import logging
-from typing import Optional, List, Dict, Any
+import threading
+from collections import OrderedDict
+from itertools import groupby
+from operator import itemgetter
+from typing import Optional, List, Dict, Any, Tuple
 from contextlib import contextmanager
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Seconds to reuse schema information before checking the schema version
+SCHEMA_CACHE_TTL = int(os.environ.get("SCHEMA_CACHE_TTL", "30"))
+
+# Seconds before schema information is re-read even if the version is unchanged
+SCHEMA_MAX_AGE = int(os.environ.get("SCHEMA_MAX_AGE", "900"))
+
+# Connection pool sizing: connections kept open, plus extra opened under load
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+
+# Check pooled connections idle longer than this many seconds with SELECT 1
+# before use, so connections dropped by the server aren't handed out
+DB_POOL_PING_AFTER = int(os.environ.get("DB_POOL_PING_AFTER", "60"))
+
+# Replace pooled connections older than this many seconds (0 disables)
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+
+# Run PostgreSQL queries as server-side prepared statements, with string
+# literals bound as parameters, so repeated query shapes skip parsing
+PREPARED_STATEMENTS_ENABLED = os.environ.get("PREPARED_STATEMENTS_ENABLED", "false").lower() == "true"
+PREPARED_STATEMENT_CACHE_SIZE = int(os.environ.get("PREPARED_STATEMENT_CACHE_SIZE", "256"))
+
+# Keywords that may not appear anywhere in a query, matched as whole words
+# so identifiers like created_at or last_update are allowed
+_FORBIDDEN_KEYWORDS = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|TRUNCATE|GRANT|REVOKE)\b", re.IGNORECASE
+)
+
+# String literals not part of a typed literal like DATE '...' or E'...'
+_STRING_LITERAL_PATTERN = re.compile(r"(?<![\w'])'((?:[^']|'')*)'")
+_TYPED_LITERAL_PREFIX = re.compile(r"\b(date|time|timestamp|timestamptz|interval)\s*$", re.IGNORECASE)
+
+
+def parameterize_query(query: str) -> Optional[Tuple[str, List[str]]]:
+    """
+    Replace string literals in a query with $n parameters.
+
+    Numbers are left in place, since they can be positional references
+    (ORDER BY 1) whose meaning would change as parameters.
+
+    Args:
+        query: SQL query
+
+    Returns:
+        (signature, values) where signature is the whitespace-normalized
+        query with $1..$n placeholders, or None if the query can't be
+        parameterized safely (comments, dollar quoting, or no literals)
+    """
+    if "--" in query or "/*" in query or "$" in query:
+        return None
+
+    values = []
+
+    def replace(match: re.Match) -> str:
+        if _TYPED_LITERAL_PREFIX.search(query, 0, match.start()):
+            return match.group(0)
+        values.append(match.group(1).replace("''", "'"))
+        return f"${len(values)}"
+
+    signature = _STRING_LITERAL_PATTERN.sub(replace, query)
+    if not values:
+        return None
+    return " ".join(signature.split()), values
+
 
 class DatabaseConnection:
     """
     Database connection manager for PostgreSQL and MySQL.
 
     Uses readonly credentials to ensure the agent cannot modify data.
+    Queries run on connections borrowed from a pool, so concurrent requests
+    don't serialize on a single connection.
     """
 
     def __init__(
@@ -43,7 +117,21 @@ class DatabaseConnection:
         self.password = password or os.environ.get("DB_PASSWORD")
         self.ssl_mode = ssl_mode or os.environ.get("DB_SSL_MODE", "require")
 
-        self._connection = None
+        self._pool = None
+        max_connections = DB_POOL_SIZE + DB_MAX_OVERFLOW
+        if self.db_type == "mysql":
+            max_connections = min(max_connections, 32)  # mysql-connector maximum pool size
+        self._max_connections = max_connections
+        self._pool_slots = threading.BoundedSemaphore(max_connections)
+        self._pool_lock = threading.Lock()
+        self._last_used: Dict[int, float] = {}  # Connection id -> when it was last returned
+        self._opened_at: Dict[int, float] = {}  # Connection id -> when it was first borrowed
+        self._cached_schema: Optional[tuple] = None  # (checked_at, fetched_at, version, schema_info)
+        self._schema_lock = threading.Lock()
+        # Prepared statement names by connection id, and signatures that failed to prepare
+        self._prepared: Dict[int, "OrderedDict[str, str]"] = {}
+        self._unpreparable: "OrderedDict[str, None]" = OrderedDict()
+        self._prepared_lock = threading.Lock()
         self._validate_config()
 
     def _validate_config(self):
@@ -62,54 +150,160 @@ class DatabaseConnection:
             raise ValueError(f"Missing required database configuration: {', '.join(missing)}")
 
     def connect(self):
-        """Establish database connection."""
-        if self._connection is not None:
-            return self._connection
+        """Create the connection pool (idempotent)."""
+        with self._pool_lock:
+            if self._pool is not None:
+                return self._pool
+
+            logger.info(f"Connecting to {self.db_type} database at {self.host}:{self.port}/{self.database}")
+
+            if self.db_type == "postgres":
+                from psycopg2.pool import ThreadedConnectionPool
+                self._pool = ThreadedConnectionPool(
+                    1,
+                    self._max_connections,
+                    host=self.host,
+                    port=self.port,
+                    dbname=self.database,
+                    user=self.user,
+                    password=self.password,
+                    sslmode=self.ssl_mode
+                )
+                # psycopg2 closes returned connections once minconn are idle,
+                # which would reconnect on every concurrent request. Open one
+                # connection up front but keep up to DB_POOL_SIZE for reuse.
+                self._pool.minconn = min(DB_POOL_SIZE, self._max_connections)
+            elif self.db_type == "mysql":
+                from mysql.connector.pooling import MySQLConnectionPool
+                self._pool = MySQLConnectionPool(
+                    pool_name=f"datascience_{id(self)}",
+                    pool_size=self._max_connections,
+                    host=self.host,
+                    port=self.port,
+                    database=self.database,
+                    user=self.user,
+                    password=self.password,
+                    ssl_disabled=(self.ssl_mode == "disable"),
+                    autocommit=True
+                )
+            else:
+                raise ValueError(f"Unsupported database type: {self.db_type}")
+
+            logger.info(f"Database connection pool established (size: {DB_POOL_SIZE}, overflow: {DB_MAX_OVERFLOW})")
+            return self._pool
 
-        logger.info(f"Connecting to {self.db_type} database at {self.host}:{self.port}/{self.database}")
-
-        if self.db_type == "postgres":
-            import psycopg2
-            self._connection = psycopg2.connect(
-                host=self.host,
-                port=self.port,
-                dbname=self.database,
-                user=self.user,
-                password=self.password,
-                sslmode=self.ssl_mode
-            )
-        elif self.db_type == "mysql":
-            import mysql.connector
-            self._connection = mysql.connector.connect(
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                user=self.user,
-                password=self.password,
-                ssl_disabled=(self.ssl_mode == "disable")
-            )
-        else:
-            raise ValueError(f"Unsupported database type: {self.db_type}")
+    def close(self):
+        """Close all pooled database connections."""
+        with self._pool_lock:
+            if self._pool is None:
+                return
+            if self.db_type == "postgres":
+                self._pool.closeall()
+            self._pool = None
+            self._last_used.clear()
+            self._opened_at.clear()
+            self._cached_schema = None
+            logger.info("Database connection pool closed")
+
+    def _is_alive(self, conn) -> bool:
+        """
+        Check a pooled PostgreSQL connection before use.
 
-        logger.info("Database connection established")
-        return self._connection
+        Connections past DB_POOL_RECYCLE seconds old are retired; others are
+        pinged only after DB_POOL_PING_AFTER idle seconds. New connections are
+        switched to autocommit before the ping, so the ping doesn't leave a
+        transaction open.
+        """
+        if conn.closed:
+            return False
+        now = time.monotonic()
+        opened_at = self._opened_at.setdefault(id(conn), now)
+        if DB_POOL_RECYCLE > 0 and now - opened_at > DB_POOL_RECYCLE:
+            return False
+        last_used = self._last_used.get(id(conn))
+        if last_used is not None and now - last_used < DB_POOL_PING_AFTER:
+            return True
+        try:
+            # Readonly queries don't need transactions; autocommit also
+            # keeps a failed query from aborting later ones on this connection
+            if not conn.autocommit:
+                conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, pool, conn) -> None:
+        """Close a pooled PostgreSQL connection and forget its state."""
+        self._last_used.pop(id(conn), None)
+        self._opened_at.pop(id(conn), None)
+        with self._prepared_lock:
+            self._prepared.pop(id(conn), None)
+        pool.putconn(conn, close=True)
 
-    def close(self):
-        """Close the database connection."""
-        if self._connection is not None:
-            self._connection.close()
-            self._connection = None
-            logger.info("Database connection closed")
+    @contextmanager
+    def connection(self):
+        """Borrow a connection from the pool, blocking while all are in use."""
+        pool = self.connect()
+        with self._pool_slots:
+            if self.db_type == "postgres":
+                # psycopg2 pools hand out the most recently returned connection
+                # first (LIFO), so bursts reuse warm connections and rarely used
+                # ones age out through the checks below
+                conn = pool.getconn()
+                try:
+                    for _ in range(self._max_connections):
+                        if self._is_alive(conn):
+                            break
+                        # Replace connections dropped by the server or due for recycling
+                        self._discard(pool, conn)
+                        conn = None
+                        conn = pool.getconn()
+                    if not conn.autocommit:
+                        conn.autocommit = True
+                except Exception:
+                    # Never leak a connection that failed setup
+                    if conn is not None:
+                        self._discard(pool, conn)
+                    raise
+                try:
+                    yield conn
+                finally:
+                    if conn.closed:
+                        self._discard(pool, conn)
+                    else:
+                        self._last_used[id(conn)] = time.monotonic()
+                        pool.putconn(conn)
+            else:
+                # mysql-connector reconnects dropped pooled connections on checkout
+                conn = pool.get_connection()
+                try:
+                    yield conn
+                finally:
+                    conn.close()  # Returns the connection to the pool
 
     @contextmanager
     def cursor(self):
-        """Get a database cursor within a context manager."""
-        conn = self.connect()
-        cursor = conn.cursor()
-        try:
-            yield cursor
-        finally:
-            cursor.close()
+        """Get a database cursor on a pooled connection within a context manager."""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    @staticmethod
+    def _check_readonly(query: str) -> None:
+        """Raise ValueError unless the query is a SELECT without forbidden keywords."""
+        # Security check: only allow SELECT queries
+        if query.lstrip()[:6].upper() != "SELECT":
+            raise ValueError("Only SELECT queries are allowed for security reasons")
+
+        # Additional safety checks
+        forbidden = _FORBIDDEN_KEYWORDS.search(query)
+        if forbidden:
+            raise ValueError(f"Query contains forbidden keyword: {forbidden.group(1).upper()}")
 
     def execute_query(self, query: str, params: Optional[tuple] = None) -> Dict[str, Any]:
         """
@@ -122,19 +316,18 @@ class DatabaseConnection:
         Returns:
             Dictionary with columns and rows
         """
-        # Security check: only allow SELECT queries
-        query_upper = query.strip().upper()
-        if not query_upper.startswith("SELECT"):
-            raise ValueError("Only SELECT queries are allowed for security reasons")
-
-        # Additional safety checks
-        dangerous_keywords = ["INSERT", "UPDATE", "DELETE", "DROP", "CREATE", "ALTER", "TRUNCATE", "GRANT", "REVOKE"]
-        for keyword in dangerous_keywords:
-            if keyword in query_upper:
-                raise ValueError(f"Query contains forbidden keyword: {keyword}")
+        self._check_readonly(query)
 
         logger.info(f"Executing query: {query[:100]}...")
 
+        if (
+            PREPARED_STATEMENTS_ENABLED and PREPARED_STATEMENT_CACHE_SIZE > 0
+            and self.db_type == "postgres" and params is None
+        ):
+            parameterized = parameterize_query(query)
+            if parameterized is not None:
+                return self._execute_prepared(query, *parameterized)
+
         with self.cursor() as cursor:
             cursor.execute(query, params)
 
@@ -152,82 +345,207 @@ class DatabaseConnection:
                 "row_count": len(rows)
             }
 
+    def _execute_prepared(self, query: str, signature: str, values: List[str]) -> Dict[str, Any]:
+        """
+        Execute a parameterized query as a PostgreSQL prepared statement.
+
+        Statements are prepared per connection on first use, in the same
+        round trip as their first execution. Signatures that fail to prepare
+        (e.g. parameter types PostgreSQL can't infer) run as plain queries.
+
+        Args:
+            query: Original SQL query, used if preparing isn't possible
+            signature: Query with string literals replaced by $n parameters
+            values: Literal values for the parameters, in order
+
+        Returns:
+            Dictionary with columns and rows
+        """
+        from psycopg2 import errors
+
+        name = "ds_" + hashlib.blake2b(signature.encode(), digest_size=8).hexdigest()
+        placeholders = ", ".join(["%s"] * len(values))
+        execute_sql = f"EXECUTE {name} ({placeholders})"
+
+        with self.connection() as conn:
+            with self._prepared_lock:
+                unpreparable = signature in self._unpreparable
+                statements = self._prepared.setdefault(id(conn), OrderedDict())
+                is_prepared = name in statements
+                if is_prepared:
+                    statements.move_to_end(name)
+
+            newly_prepared = False
+            with conn.cursor() as cursor:
+                if unpreparable:
+                    cursor.execute(query)
+                elif is_prepared:
+                    try:
+                        cursor.execute(execute_sql, values)
+                    except errors.InvalidSqlStatementName:
+                        # A replaced connection reused this id; prepare again
+                        is_prepared = False
+                if not unpreparable and not is_prepared:
+                    prepare_sql = f"PREPARE {name} AS {signature.replace('%', '%%')}; "
+                    try:
+                        cursor.execute(prepare_sql + execute_sql, values)
+                    except Exception as e:
+                        # Running the original query surfaces any real error as written
+                        logger.info(f"Could not prepare query, running it directly: {e}")
+                        with self._prepared_lock:
+                            self._unpreparable[signature] = None
+                            while len(self._unpreparable) > PREPARED_STATEMENT_CACHE_SIZE:
+                                self._unpreparable.popitem(last=False)
+                        cursor.execute(query)
+                    else:
+                        newly_prepared = True
+
+                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                rows = cursor.fetchall()
+
+                if newly_prepared:
+                    self._remember_prepared(conn, cursor, name)
+
+        logger.info(f"Query returned {len(rows)} rows")
+        return {
+            "columns": columns,
+            "rows": rows,
+            "row_count": len(rows)
+        }
+
+    def _remember_prepared(self, conn, cursor, name: str) -> None:
+        """Record a statement prepared on a connection, deallocating the oldest past the limit."""
+        with self._prepared_lock:
+            statements = self._prepared.setdefault(id(conn), OrderedDict())
+            statements[name] = name
+            evicted = []
+            while len(statements) > PREPARED_STATEMENT_CACHE_SIZE:
+                evicted.append(statements.popitem(last=False)[0])
+        for old_name in evicted:
+            cursor.execute(f"DEALLOCATE {old_name}")
+
     def get_schema_info(self) -> Dict[str, Any]:
         """
         Get database schema information including tables and columns.
 
+        Tables and columns are read with a single information_schema query,
+        rather than one query per table.
+
         Returns:
             Dictionary with table information
         """
+        if self.db_type == "postgres":
+            schema = "public"
+        elif self.db_type == "mysql":
+            schema = self.database
+        else:
+            return {"tables": {}}
+
+        # All tables and their columns in one round trip (LEFT JOIN keeps
+        # tables without columns)
+        schema_query = """
+            SELECT t.table_name, c.column_name, c.data_type, c.is_nullable, c.column_default
+            FROM information_schema.tables t
+            LEFT JOIN information_schema.columns c
+                ON c.table_schema = t.table_schema AND c.table_name = t.table_name
+            WHERE t.table_schema = %s
+            AND t.table_type = 'BASE TABLE'
+            ORDER BY t.table_name, c.ordinal_position
+        """
+        result = self.execute_query(schema_query, (schema,))
+
         tables = {}
+        for table_name, rows in groupby(result["rows"], key=itemgetter(0)):
+            tables[table_name] = {
+                "columns": [
+                    {
+                        "name": row[1],
+                        "type": row[2],
+                        "nullable": row[3] == "YES",
+                        "default": row[4]
+                    }
+                    for row in rows
+                    if row[1] is not None
+                ]
+            }
 
+        return {"tables": tables}
+
+    def get_schema_version(self) -> Optional[str]:
+        """
+        Get a cheap fingerprint of the schema's tables and columns.
+
+        A single aggregate query over information_schema.columns, so checking
+        for schema changes costs one small round-trip instead of a full read.
+
+        Returns:
+            Fingerprint string, or None if it could not be computed
+        """
         if self.db_type == "postgres":
-            # Get tables
-            table_query = """
-                SELECT table_name
-                FROM information_schema.tables
+            version_query = """
+                SELECT count(*), md5(string_agg(
+                    table_name || '.' || column_name || ':' || data_type || ':' ||
+                    is_nullable || ':' || coalesce(column_default, ''),
+                    ',' ORDER BY table_name, ordinal_position
+                ))
+                FROM information_schema.columns
                 WHERE table_schema = 'public'
-                AND table_type = 'BASE TABLE'
-                ORDER BY table_name
             """
-            result = self.execute_query(table_query)
-
-            for (table_name,) in result["rows"]:
-                # Get columns for each table
-                column_query = """
-                    SELECT column_name, data_type, is_nullable, column_default
-                    FROM information_schema.columns
-                    WHERE table_schema = 'public' AND table_name = %s
-                    ORDER BY ordinal_position
-                """
-                col_result = self.execute_query(column_query, (table_name,))
-
-                tables[table_name] = {
-                    "columns": [
-                        {
-                            "name": row[0],
-                            "type": row[1],
-                            "nullable": row[2] == "YES",
-                            "default": row[3]
-                        }
-                        for row in col_result["rows"]
-                    ]
-                }
-
         elif self.db_type == "mysql":
-            # Get tables
-            table_query = f"""
-                SELECT table_name
-                FROM information_schema.tables
-                WHERE table_schema = '{self.database}'
-                AND table_type = 'BASE TABLE'
-                ORDER BY table_name
+            version_query = """
+                SELECT COUNT(*), SUM(CRC32(CONCAT_WS(':',
+                    table_name, column_name, data_type, is_nullable, IFNULL(column_default, '')
+                )))
+                FROM information_schema.columns
+                WHERE table_schema = %s
             """
-            result = self.execute_query(table_query)
-
-            for (table_name,) in result["rows"]:
-                # Get columns for each table
-                column_query = f"""
-                    SELECT column_name, data_type, is_nullable, column_default
-                    FROM information_schema.columns
-                    WHERE table_schema = '{self.database}' AND table_name = '{table_name}'
-                    ORDER BY ordinal_position
-                """
-                col_result = self.execute_query(column_query)
-
-                tables[table_name] = {
-                    "columns": [
-                        {
-                            "name": row[0],
-                            "type": row[1],
-                            "nullable": row[2] == "YES",
-                            "default": row[3]
-                        }
-                        for row in col_result["rows"]
-                    ]
-                }
+        else:
+            return None
 
-        return {"tables": tables}
+        params = (self.database,) if self.db_type == "mysql" else None
+        try:
+            column_count, checksum = self.execute_query(version_query, params)["rows"][0]
+        except Exception as e:
+            logger.warning(f"Schema version check failed: {e}")
+            return None
+        return f"{column_count}:{checksum}"
+
+    def get_cached_schema_info(self, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Get schema information, re-reading it only when the schema changes.
+
+        Cached schema is reused for SCHEMA_CACHE_TTL seconds. After that the
+        schema version is checked; if it is unchanged the cached schema is
+        kept for another TTL, up to SCHEMA_MAX_AGE seconds in total.
+        Concurrent callers that find the cache stale wait for a single
+        check or re-read rather than each querying the database.
+
+        Args:
+            refresh: Ignore any cached schema and re-read it from the database
+
+        Returns:
+            Dictionary with table information
+        """
+        cached = self._cached_schema
+        if not refresh and cached is not None and time.monotonic() - cached[0] < SCHEMA_CACHE_TTL:
+            return cached[3]
+
+        with self._schema_lock:
+            now = time.monotonic()
+            if not refresh and self._cached_schema is not None:
+                checked_at, fetched_at, version, schema_info = self._cached_schema
+                if now - checked_at < SCHEMA_CACHE_TTL:
+                    return schema_info  # Refreshed by another caller while waiting
+                if version is not None and now - fetched_at < SCHEMA_MAX_AGE:
+                    if self.get_schema_version() == version:
+                        self._cached_schema = (now, fetched_at, version, schema_info)
+                        return schema_info
+                    logger.info("Schema version changed, re-reading schema")
+
+            version = self.get_schema_version()
+            schema_info = self.get_schema_info()
+            self._cached_schema = (now, now, version, schema_info)
+            return schema_info
 
     def get_sample_data(self, table_name: str, limit: int = 5) -> Dict[str, Any]:
         """
@@ -248,15 +566,18 @@ class DatabaseConnection:
         return self.execute_query(query)
 
 
-# Global database connection instance
+# Global database connection instance, shared by every request in the process
 _db_connection: Optional[DatabaseConnection] = None
+_db_connection_lock = threading.Lock()
 
 
 def get_database() -> DatabaseConnection:
     """Get or create the global database connection."""
     global _db_connection
     if _db_connection is None:
-        _db_connection = DatabaseConnection()
+        with _db_connection_lock:
+            if _db_connection is None:
+                _db_connection = DatabaseConnection()
     return _db_connection
 
 
@@ -284,7 +605,13 @@ def get_schema() -> Dict[str, Any]:
         Dictionary with table and column information
     """
     db = get_database()
-    return db.get_schema_info()
+    return db.get_cached_schema_info()
+
+
+@lru_cache(maxsize=64)
+def _row_template(widths: Tuple[int, ...]) -> str:
+    """Format string padding each column to its width, shared by same-shape tables."""
+    return " | ".join(f"{{:<{width}}}" for width in widths)
 
 
 def format_results_as_table(result: Dict[str, Any], max_rows: int = 20) -> str:
@@ -301,30 +628,27 @@ def format_results_as_table(result: Dict[str, Any], max_rows: int = 20) -> str:
     if not result.get("columns") or not result.get("rows"):
         return "No results"
 
-    columns = result["columns"]
-    rows = result["rows"][:max_rows]
+    columns = [str(col) for col in result["columns"]]
+    # Stringify each displayed value once
+    rows = [
+        ["NULL" if val is None else str(val) for val in row]
+        for row in result["rows"][:max_rows]
+    ]
 
-    # Calculate column widths
-    widths = [len(str(col)) for col in columns]
-    for row in rows:
-        for i, val in enumerate(row):
-            widths[i] = max(widths[i], len(str(val) if val is not None else "NULL"))
+    # Calculate column widths, one pass per column
+    widths = [len(col) for col in columns]
+    for i, values in enumerate(zip(*rows)):
+        widths[i] = max(widths[i], max(map(len, values)))
 
-    # Build table
-    lines = []
+    # One format template for the header and every row
+    template = _row_template(tuple(widths))
 
     # Header
-    header = " | ".join(str(col).ljust(widths[i]) for i, col in enumerate(columns))
-    lines.append(header)
-    lines.append("-" * len(header))
+    header = template.format(*columns)
+    lines = [header, "-" * len(header)]
 
     # Rows
-    for row in rows:
-        line = " | ".join(
-            str(val if val is not None else "NULL").ljust(widths[i])
-            for i, val in enumerate(row)
-        )
-        lines.append(line)
+    lines.extend(template.format(*row) for row in rows)
 
     if len(result["rows"]) > max_rows:
         lines.append(f"... ({len(result['rows']) - max_rows} more rows)")
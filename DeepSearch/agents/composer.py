@@ -1,12 +1,15 @@
 import os
 import logging
+from functools import lru_cache
 from typing import List, Dict
 from pydantic import BaseModel, Field
 from langchain_gradient import ChatGradient
 
 # Import prompts from central prompts.py - edit that file to customize
 import sys
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _APP_DIR not in sys.path:
+    sys.path.insert(0, _APP_DIR)
 from prompts import COMPOSER_PROMPT
 
 logger = logging.getLogger(__name__)
@@ -34,30 +37,61 @@ def get_composer_model():
     )
 
 
+@lru_cache(maxsize=1)
+def get_structured_composer():
+    """Composer model bound to the FinalReport schema, built once per process."""
+    return get_composer_model().with_structured_output(FinalReport)
+
+
 def format_section_findings(section_findings: List[Dict]) -> str:
-    """Format section findings for the composer prompt."""
-    text = ""
+    """
+    Format section findings for the composer prompt.
+
+    Findings are dicts with the fields of researcher.Finding (content,
+    source_url, source_title), as produced by every research step; missing
+    fields fall back to defaults.
+    """
+    parts = []
     for section in section_findings:
-        text += f"\n### {section['section_title']}\n"
-        text += f"**Description:** {section.get('section_description', '')}\n\n"
-        text += f"**Research Summary:**\n{section.get('combined_summary', 'No summary available')}\n\n"
+        parts.append(f"\n### {section['section_title']}\n")
+        parts.append(f"**Description:** {section.get('section_description', '')}\n\n")
+        parts.append(f"**Research Summary:**\n{section.get('combined_summary', 'No summary available')}\n\n")
 
         if section.get("all_findings"):
-            text += "**Key Findings:**\n"
-            for finding in section["all_findings"][:10]:  # Limit to top 10 findings per section
-                if isinstance(finding, dict):
-                    text += f"- {finding.get('content', '')} [Source: {finding.get('source_title', 'Unknown')}]\n"
-        text += "\n"
-    return text
+            parts.append("**Key Findings:**\n")
+            parts.extend(
+                f"- {finding.get('content', '')} [Source: {finding.get('source_title', 'Unknown')}]\n"
+                for finding in section["all_findings"][:10]  # Limit to top 10 findings per section
+            )
+        parts.append("\n")
+    return "".join(parts)
 
 
 def format_sources(all_sources: Dict) -> str:
-    """Format sources for the composer prompt with numbered references."""
-    text = ""
-    for i, (url, source) in enumerate(all_sources.items(), 1):
-        title = source.get("title", "Unknown")
-        text += f"[{i}] {title}\n    URL: {url}\n"
-    return text
+    """
+    Format sources for the composer prompt with numbered references.
+
+    Sources carry the reference number assigned when they were first
+    collected; older entries without one are numbered by position.
+    """
+    return "".join(
+        f"[{source.get('index', i)}] {source.get('title', 'Unknown')}\n    URL: {url}\n"
+        for i, (url, source) in enumerate(all_sources.items(), 1)
+    )
+
+
+def format_report_markdown(report: FinalReport) -> str:
+    """Format a composed report as markdown."""
+    parts = [f"# {report.title}\n\n", f"{report.introduction}\n\n"]
+
+    for section in report.sections:
+        parts.append(f"## {section.title}\n\n")
+        parts.append(f"{section.content}\n\n")
+
+    parts.append(f"## Conclusion\n\n{report.conclusion}\n\n")
+    parts.append("## References\n\n")
+    parts.extend(f"{ref}\n" for ref in report.references)
+    return "".join(parts)
 
 
 def compose_report(state: dict) -> dict:
@@ -84,12 +118,41 @@ def compose_report(state: dict) -> dict:
     introduction_points = "\n".join(report_outline.introduction_points) if report_outline else ""
     conclusion_points = "\n".join(report_outline.conclusion_points) if report_outline else ""
 
+    # Nothing to synthesize: skip the composer model
+    if not any(section.get("all_findings") for section in section_findings):
+        logger.warning("  No research findings to compose, returning an empty report")
+        report = FinalReport(
+            title=report_title,
+            introduction="No findings were gathered for this topic.",
+            sections=[],
+            conclusion="",
+            references=[]
+        )
+        return {"final_report": report, "markdown_report": format_report_markdown(report)}
+
+    # A single section with at most one source is reported as researched
+    if len(section_findings) == 1 and len(all_sources) <= 1:
+        logger.info("  Single section with at most one source, formatting it directly")
+        section = section_findings[0]
+        report = FinalReport(
+            title=report_title,
+            introduction=introduction_points,
+            sections=[ComposedSection(
+                title=section["section_title"],
+                content=section.get("combined_summary", "") + (" [1]" if all_sources else "")
+            )],
+            conclusion=conclusion_points,
+            references=[
+                f"[1] {source.get('title', 'Unknown')} - {url}" for url, source in all_sources.items()
+            ]
+        )
+        return {"final_report": report, "markdown_report": format_report_markdown(report)}
+
     # Format inputs for composer
     section_findings_text = format_section_findings(section_findings)
     sources_text = format_sources(all_sources)
 
-    composer_model = get_composer_model()
-    structured_model = composer_model.with_structured_output(FinalReport)
+    structured_model = get_structured_composer()
 
     prompt = COMPOSER_PROMPT.format(
         topic=topic,
@@ -105,17 +168,7 @@ def compose_report(state: dict) -> dict:
 
     # Format the report as markdown
     logger.info("  Formatting markdown output...")
-    markdown_report = f"# {report.title}\n\n"
-    markdown_report += f"{report.introduction}\n\n"
-
-    for section in report.sections:
-        markdown_report += f"## {section.title}\n\n"
-        markdown_report += f"{section.content}\n\n"
-
-    markdown_report += f"## Conclusion\n\n{report.conclusion}\n\n"
-    markdown_report += "## References\n\n"
-    for ref in report.references:
-        markdown_report += f"{ref}\n"
+    markdown_report = format_report_markdown(report)
 
     logger.info(f"  Report composed: {len(markdown_report)} characters, {len(report.sections)} sections")
 
@@ -1,11 +1,30 @@
 import os
+import hashlib
 import logging
-from typing import List, Literal
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 from langchain_gradient import ChatGradient
 
+# Search tool from tools/ in the app directory, imported once at load time
+import sys
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _APP_DIR not in sys.path:
+    sys.path.insert(0, _APP_DIR)
+from tools.serper_search import serper_search
+
 logger = logging.getLogger(__name__)
 
+# Recent section evaluations by a hash of everything the evaluator sees, so
+# re-evaluating unchanged findings (e.g. every follow-up query failed) only
+# repeats the previous verdict without another LLM call
+EVALUATION_CACHE_SIZE = 128
+_evaluation_cache: "OrderedDict[str, SectionEvaluation]" = OrderedDict()
+_evaluation_cache_lock = threading.Lock()
+
 SECTION_EVALUATOR_PROMPT = """You are a critical research evaluator. Your task is to assess the quality and completeness of research findings for a specific section of a report.
 
 Research Topic: {topic}
@@ -50,6 +69,12 @@ def get_evaluator_model():
     )
 
 
+@lru_cache(maxsize=1)
+def get_structured_evaluator():
+    """Evaluator model bound to the SectionEvaluation schema, built once per process."""
+    return get_evaluator_model().with_structured_output(SectionEvaluation)
+
+
 def evaluate_section(state: dict) -> dict:
     """
     Evaluate the quality of research for the most recently completed section.
@@ -88,9 +113,6 @@ def evaluate_section(state: dict) -> dict:
 
     gaps_text = "\n".join(latest_section.get("gaps", [])) or "No gaps identified"
 
-    evaluator_model = get_evaluator_model()
-    structured_model = evaluator_model.with_structured_output(SectionEvaluation)
-
     prompt = SECTION_EVALUATOR_PROMPT.format(
         topic=topic,
         section_title=section_title,
@@ -98,8 +120,22 @@ def evaluate_section(state: dict) -> dict:
         findings=findings_text,
         gaps=gaps_text
     )
+    prompt_hash = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+
+    with _evaluation_cache_lock:
+        evaluation = _evaluation_cache.get(prompt_hash)
+        if evaluation is not None:
+            _evaluation_cache.move_to_end(prompt_hash)
 
-    evaluation = structured_model.invoke([{"role": "user", "content": prompt}])
+    if evaluation is not None:
+        logger.info("  Findings unchanged since last evaluation, skipping redundant evaluation")
+    else:
+        structured_model = get_structured_evaluator()
+        evaluation = structured_model.invoke([{"role": "user", "content": prompt}])
+        with _evaluation_cache_lock:
+            _evaluation_cache[prompt_hash] = evaluation
+            while len(_evaluation_cache) > EVALUATION_CACHE_SIZE:
+                _evaluation_cache.popitem(last=False)
 
     logger.info(f"  Evaluation grade: {evaluation.grade}")
     logger.info(f"  Strengths: {len(evaluation.strengths)}, Weaknesses: {len(evaluation.weaknesses)}")
@@ -147,11 +183,6 @@ def enhanced_section_research(state: dict) -> dict:
     Returns:
         Updated state with additional findings
     """
-    # Import here to avoid circular imports
-    import sys
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from tools.serper_search import serper_search
-
     topic = state.get("topic", "")
     follow_up_queries = state.get("current_follow_up_queries", [])
     section_findings = state.get("section_findings", [])
@@ -171,9 +202,8 @@ def enhanced_section_research(state: dict) -> dict:
         temperature=0.2
     )
 
-    enhanced_findings = []
-
-    for query in follow_up_queries[:3]:
+    def run_follow_up(query: str) -> Optional[dict]:
+        """Search and summarize one follow-up query (None on error)."""
         logger.info(f"  Follow-up query: {query[:50]}...")
 
         try:
@@ -195,7 +225,8 @@ Provide a brief summary of the key findings that address gaps in the current res
 
             response = researcher_model.invoke([{"role": "user", "content": analysis_prompt}])
 
-            enhanced_findings.append({
+            logger.info(f"    Added {len(search_results.results[:3])} findings")
+            return {
                 "query": query,
                 "summary": response.content,
                 "findings": [
@@ -206,23 +237,34 @@ Provide a brief summary of the key findings that address gaps in the current res
                     }
                     for r in search_results.results[:3]
                 ]
-            })
-
-            # Track sources
-            for r in search_results.results[:3]:
-                if r.link not in all_sources:
-                    all_sources[r.link] = {
-                        "url": r.link,
-                        "title": r.title,
-                        "sections": []
-                    }
-                if section_title not in all_sources[r.link]["sections"]:
-                    all_sources[r.link]["sections"].append(section_title)
-
-            logger.info(f"    Added {len(search_results.results[:3])} findings")
+            }
 
         except Exception as e:
             logger.error(f"    Error in follow-up query: {str(e)}")
+            return None
+
+    # Follow-up queries are independent: search and summarize them concurrently,
+    # keeping results in query order
+    queries = follow_up_queries[:3]
+    with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        enhanced_findings = [ef for ef in executor.map(run_follow_up, queries) if ef]
+
+    # Track sources, once per URL
+    new_sources = {}
+    for ef in enhanced_findings:
+        for finding in ef["findings"]:
+            new_sources.setdefault(finding["source_url"], finding["source_title"])
+    for link, title in new_sources.items():
+        source = all_sources.get(link)
+        if source is None:
+            source = all_sources[link] = {
+                "url": link,
+                "title": title,
+                "sections": [],
+                "index": len(all_sources) + 1
+            }
+        if section_title not in source["sections"]:
+            source["sections"].append(section_title)
 
     # Update the latest section with enhanced findings
     if enhanced_findings:
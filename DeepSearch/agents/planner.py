@@ -6,7 +6,9 @@ from langchain_gradient import ChatGradient
 
 # Import prompts from central prompts.py - edit that file to customize
 import sys
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _APP_DIR not in sys.path:
+    sys.path.insert(0, _APP_DIR)
 from prompts import PLAN_GENERATOR_PROMPT, PLAN_REFINEMENT_PROMPT
 
 logger = logging.getLogger(__name__)
@@ -1,31 +1,43 @@
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 from pydantic import BaseModel, Field
 from langchain_gradient import ChatGradient
 
-logger = logging.getLogger(__name__)
+# Search tool from tools/ in the app directory, imported once at load time
+import sys
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _APP_DIR not in sys.path:
+    sys.path.insert(0, _APP_DIR)
+from tools.serper_search import serper_search
 
-# Import will be done at runtime to avoid circular imports
-# from tools.serper_search import serper_search
+logger = logging.getLogger(__name__)
 
-RESEARCHER_PROMPT = """You are a thorough research analyst. Your task is to analyze search results and extract relevant information for a specific section of a research report.
+# Maximum search queries of one section researched at the same time
+MAX_PARALLEL_QUERIES = 4
 
-Research Topic: {topic}
-Current Section: {section_title}
-Section Description: {section_description}
-Search Query: {query}
+# Instructions and section context: identical for every query of a section, and
+# sent first as the system message so automatic prompt caching can reuse it
+RESEARCHER_SYSTEM_PROMPT = """You are a thorough research analyst. Your task is to analyze search results and extract relevant information for a specific section of a research report.
 
-Search Results:
-{search_results}
-
-Analyze these search results and extract:
+Analyze the search results you are given and extract:
 1. Key facts and findings relevant to this section
 2. Important data points, statistics, or quotes
 3. Source attribution for each piece of information
 
 Synthesize the information into a coherent summary that will help write this section of the report.
-Be specific about which sources support which claims."""
+Be specific about which sources support which claims.
+
+Research Topic: {topic}
+Current Section: {section_title}
+Section Description: {section_description}"""
+
+# Per-query part of the prompt
+RESEARCHER_QUERY_PROMPT = """Search Query: {query}
+
+Search Results:
+{search_results}"""
 
 
 class Finding(BaseModel):
@@ -60,11 +72,6 @@ def research_current_section(state: dict) -> dict:
     Returns:
         Updated state with research findings for the current section
     """
-    # Import here to avoid circular imports
-    import sys
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from tools.serper_search import serper_search
-
     topic = state.get("topic", "")
     outline = state.get("report_outline")
     current_index = state.get("current_section_index", 0)
@@ -90,64 +97,79 @@ def research_current_section(state: dict) -> dict:
         "gaps": []
     }
 
-    # Execute each search query for this section
-    for query_index, query in enumerate(current_section.search_queries):
-        logger.info(f"  Executing query {query_index + 1}/{len(current_section.search_queries)}: {query[:50]}...")
+    queries = current_section.search_queries
+    system_prompt = RESEARCHER_SYSTEM_PROMPT.format(
+        topic=topic,
+        section_title=current_section.title,
+        section_description=current_section.description
+    )
+
+    def run_query(query_index: int, query: str):
+        """Search and analyze one query; returns (research_output, error)."""
+        logger.info(f"  Executing query {query_index + 1}/{len(queries)}: {query[:50]}...")
 
         try:
             # Perform search
             search_results = serper_search(query, num_results=5)
 
             # Format search results for the prompt
-            formatted_results = ""
-            for i, result in enumerate(search_results.results, 1):
-                formatted_results += f"\n{i}. {result.title}\n"
-                formatted_results += f"   URL: {result.link}\n"
-                formatted_results += f"   {result.snippet}\n"
-
-            # Analyze results
-            prompt = RESEARCHER_PROMPT.format(
-                topic=topic,
-                section_title=current_section.title,
-                section_description=current_section.description,
-                query=query,
-                search_results=formatted_results
+            formatted_results = "".join(
+                f"\n{i}. {result.title}\n   URL: {result.link}\n   {result.snippet}\n"
+                for i, result in enumerate(search_results.results, 1)
             )
 
-            research_output = structured_model.invoke([{"role": "user", "content": prompt}])
-
-            # Store query results
-            section_research["query_results"].append({
-                "query": query,
-                "summary": research_output.summary,
-                "findings": [f.model_dump() for f in research_output.findings],
-                "quality_score": research_output.quality_score,
-                "gaps": research_output.gaps
-            })
-
-            section_research["all_findings"].extend([f.model_dump() for f in research_output.findings])
-            section_research["gaps"].extend(research_output.gaps)
-
-            # Track sources
-            for finding in research_output.findings:
-                source_key = finding.source_url
-                if source_key not in all_sources:
-                    all_sources[source_key] = {
-                        "url": finding.source_url,
-                        "title": finding.source_title,
-                        "sections": []
-                    }
-                if current_section.title not in all_sources[source_key]["sections"]:
-                    all_sources[source_key]["sections"].append(current_section.title)
+            # Analyze results
+            prompt = RESEARCHER_QUERY_PROMPT.format(query=query, search_results=formatted_results)
 
+            research_output = structured_model.invoke([
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ])
             logger.info(f"    Found {len(research_output.findings)} findings, quality score: {research_output.quality_score}/10")
+            return research_output, None
 
         except Exception as e:
             logger.error(f"    Error executing query: {str(e)}")
+            return None, e
+
+    # Queries are independent: search and analyze them concurrently, then
+    # merge results in query order
+    with ThreadPoolExecutor(max_workers=max(1, min(len(queries), MAX_PARALLEL_QUERIES))) as executor:
+        outcomes = list(executor.map(run_query, range(len(queries)), queries))
+
+    for query, (research_output, error) in zip(queries, outcomes):
+        if error is not None:
             section_research["query_results"].append({
                 "query": query,
-                "error": str(e)
+                "error": str(error)
             })
+            continue
+
+        # Store query results
+        findings = [f.model_dump() for f in research_output.findings]
+        section_research["query_results"].append({
+            "query": query,
+            "summary": research_output.summary,
+            "findings": findings,
+            "quality_score": research_output.quality_score,
+            "gaps": research_output.gaps
+        })
+
+        section_research["all_findings"].extend(findings)
+        section_research["gaps"].extend(research_output.gaps)
+
+        # Track sources
+        for finding in research_output.findings:
+            source = all_sources.get(finding.source_url)
+            if source is None:
+                source = all_sources[finding.source_url] = {
+                    "url": finding.source_url,
+                    "title": finding.source_title,
+                    "sections": [],
+                    "index": len(all_sources) + 1
+                }
+            if current_section.title not in source["sections"]:
+                source["sections"].append(current_section.title)
 
     # Create combined summary for the section
     if section_research["query_results"]:
@@ -46,7 +46,7 @@ logger = logging.getLogger("DeepSearch")
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import prompts - edit prompts.py to customize agent behavior
-from prompts import INTENT_CLASSIFICATION_PROMPT, get_section_analysis_prompt
+from prompts import INTENT_CLASSIFICATION_PROMPT, get_section_analysis_messages
 
 from agents.planner import (
     generate_initial_plan,
@@ -329,7 +329,7 @@ def research_section_node(state: SectionResearchState) -> dict:
             ])
 
             # Analyze results
-            analysis_prompt = get_section_analysis_prompt(
+            analysis_messages = get_section_analysis_messages(
                 section_title=section_title,
                 section_description=section_description,
                 query=query,
@@ -337,7 +337,7 @@ def research_section_node(state: SectionResearchState) -> dict:
                 topic=topic
             )
 
-            response = researcher_model.invoke([{"role": "user", "content": analysis_prompt}])
+            response = researcher_model.invoke(analysis_messages)
             content = response.content
 
             # Parse response
@@ -408,12 +408,12 @@ def consolidate_research_node(state: DeepSearchState) -> dict:
     # Sort results by section index
     sorted_results = sorted(section_results, key=lambda x: x.get("section_index", 0))
 
-    # Consolidate all sources
+    # Consolidate all sources, numbering them once for the composer's references
     all_sources = {}
     for result in sorted_results:
         for url, source_info in result.get("sources", {}).items():
             if url not in all_sources:
-                all_sources[url] = source_info
+                all_sources[url] = {**source_info, "index": len(all_sources) + 1}
 
     # Log summary
     total_findings = sum(len(r.get("findings", [])) for r in sorted_results)
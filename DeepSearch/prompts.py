@@ -93,17 +93,9 @@ Analyze the search results and provide:
 Be thorough but concise. Focus on information that directly addresses the key questions."""
 
 
-def get_section_analysis_prompt(section_title: str, section_description: str, query: str, formatted_results: str, topic: str) -> str:
-    """Generate the prompt for analyzing search results for a section."""
-    return f"""Analyze these search results for the section "{section_title}" of a report on "{topic}".
+SECTION_ANALYSIS_INSTRUCTIONS = """You analyze web search results for one section of a research report.
 
-Section description: {section_description}
-Query: {query}
-
-Results:
-{formatted_results}
-
-Provide:
+For each set of results, provide:
 1. A synthesis of the key findings (2-3 paragraphs)
 2. Rate the quality of these results for this section (1-10)
 
@@ -114,6 +106,32 @@ SUMMARY:
 QUALITY: [score]"""
 
 
+def get_section_analysis_messages(section_title: str, section_description: str, query: str, formatted_results: str, topic: str) -> list:
+    """
+    Generate the messages for analyzing search results for a section.
+
+    The system message (instructions, then topic and section) is identical
+    for every query of a section, so providers with automatic prompt
+    caching reuse it; only the user message with the query and its
+    results changes between calls.
+    """
+    system = f"""{SECTION_ANALYSIS_INSTRUCTIONS}
+
+Report topic: "{topic}"
+Section: "{section_title}"
+Section description: {section_description}"""
+
+    user = f"""Query: {query}
+
+Results:
+{formatted_results}"""
+
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user}
+    ]
+
+
 # =============================================================================
 # REPORT COMPOSITION PROMPT
 # =============================================================================